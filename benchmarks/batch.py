@@ -0,0 +1,77 @@
+"""Measure the throughput of check_ivs_batch (or, with --workers, of
+check_ivs_parallel), in rows per second.
+
+    $ python3 benchmarks/batch.py [--rows N] [--seed S] [--workers W]
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ivchecker.engine import Characteristic, HPType, Nature, Stat, calculate_stat, get_all_pokemon_names, get_basestats
+from ivchecker.parallel import check_ivs_parallel
+from ivchecker.runners import check_ivs_batch
+
+
+def make_observations(rows: int, seed: int) -> dict[str, list]:
+    """Generate consistent observations of random Pokémon with random IVs and EVs.
+    About half of them list a characteristic, and about a third a hidden power type.
+    """
+    rng = random.Random(seed)
+    names = get_all_pokemon_names()
+    natures = list(Nature.read_all())
+
+    characteristics: dict[tuple[Stat, int], list[str]] = {}
+    for description in Characteristic.read_all():
+        char = Characteristic.get(description)
+        characteristics.setdefault((char.high_stat, char.residue), []).append(description)
+
+    columns: dict[str, list] = {}
+    for _ in range(rows):
+        pokemon, generation, level = rng.choice(names), rng.randint(3, 9), rng.randint(1, 100)
+        nature = rng.choice(natures)
+        evs = [rng.choice((0, 0, 4, 252, rng.randint(0, 252))) for _ in Stat]
+        ivs = [rng.randint(0, 31) for _ in Stat]
+        basestats = get_basestats(pokemon, generation)
+
+        high, best = max(zip(Stat, ivs), key=lambda pair: pair[1])
+        characteristic = rng.choice(characteristics.get((high, best % 5), [""]))
+        hp_type = HPType.get(*ivs).name.title()
+
+        row = dict(pokemon=pokemon, generation=generation, level=level, nature=nature.name,
+                   characteristic=characteristic if rng.random() < 0.5 else "",
+                   hidden_power_type=hp_type if rng.random() < 0.3 else "")
+        for stat, base, iv, ev in zip(Stat, basestats, ivs, evs):
+            row[f"stat_{stat.value}"] = calculate_stat(level, base, iv, ev, nature % stat, stat)
+            row[f"ev_{stat.value}"] = ev
+
+        for key, value in row.items():
+            columns.setdefault(key, []).append(value)
+
+    return columns
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="spread the rows across this many processes")
+    args = parser.parse_args()
+
+    observations = make_observations(args.rows, args.seed)
+
+    start = time.perf_counter()
+    if args.workers:
+        check_ivs_parallel(observations, workers=args.workers)
+    else:
+        check_ivs_batch(observations)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.rows} rows in {elapsed:.3f}s: {args.rows / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure the end-to-end latency of the command-line interface (interpreter
+startup, imports, data loading and the calculation itself), and check it against
+a budget. Exits with status 1 if the median is over budget, or if any run
+imported the GUI toolkit.
+
+    $ python3 benchmarks/cli.py [--repeat N] [--budget-ms MS]
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).parent.parent
+
+COMMANDS = {
+    "check": ["check", "garchomp", "-l", "50", "-s", "183", "182", "115", "90", "105", "122", "-n", "Jolly", "-t", "Dragon"],
+    "ranges": ["ranges", "butterfree", "-g", "4", "-l", "50"],
+}
+
+# modules the CLI must never import
+FORBIDDEN_MODULES = ("tkinter", "PIL")
+
+
+def run_once(args: list[str]) -> tuple[float, list[str]]:
+    """Run the CLI once, returning the wall time and any forbidden modules it imported."""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-X", "importtime", "-m", "ivchecker", *args],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    imported = {line.split("|")[-1].strip() for line in output.stderr.splitlines() if line.startswith("import time:")}
+    return elapsed, [module for module in FORBIDDEN_MODULES if module in imported]
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    args = parser.parse_args()
+
+    # warm up the data cache, so every measured run starts the same way
+    run_once(COMMANDS["check"])
+
+    ok = True
+    for name, command in COMMANDS.items():
+        runs = [run_once(command) for _ in range(args.repeat)]
+        times = [elapsed * 1000 for elapsed, _ in runs]
+        forbidden = sorted({module for _, modules in runs for module in modules})
+
+        median = statistics.median(times)
+        verdict = "ok" if median <= args.budget_ms and not forbidden else "FAIL"
+        ok = ok and verdict == "ok"
+
+        print(f"{name:<8} median {median:7.1f} ms   min {min(times):7.1f} ms   budget {args.budget_ms:.0f} ms   "
+              f"forbidden imports: {', '.join(forbidden) or 'none'}   {verdict}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Measure the GUI's time to first paint: from the start of main.py until the
+window (with its first tab) has been drawn. Needs a display.
+
+    $ python3 benchmarks/gui.py [--repeat N]
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).parent.parent
+
+
+def run_once() -> tuple[float, float]:
+    """Start the GUI once, returning the time to first paint as reported by
+    main.py and as seen from outside (including interpreter startup), in ms.
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "main.py", "--time-to-first-paint"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    reported = float(re.search(r"time to first paint: ([\d.]+) ms", output.stdout).group(1))
+    return reported, elapsed
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    # warm up the data cache, so every measured run starts the same way
+    run_once()
+
+    runs = [run_once() for _ in range(args.repeat)]
+    for label, times in zip(("in process", "wall clock"), zip(*runs)):
+        print(f"first paint ({label}) median {statistics.median(times):7.1f} ms   min {min(times):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure cold start: the time a fresh interpreter spends importing the engine
+(and, for the last scenario, making its first check), and which heavy modules
+were loaded along the way.
+
+    $ python3 benchmarks/startup.py [--repeat N]
+"""
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).parent.parent
+
+# modules that are expensive to import, and that no scenario here should need
+HEAVY_MODULES = ("pandas", "PIL", "tkinter", "fuzzywuzzy")
+
+SCENARIOS = {
+    "import engine": "import ivchecker.engine",
+    "import runners": "import ivchecker.runners",
+    "first check_ivs": (
+        "from ivchecker.runners import check_ivs\n"
+        "check_ivs('garchomp', 9, 50, (183, 182, 115, 90, 105, 122), 'Jolly', (0, 0, 0, 0, 0, 0), None, '')"
+    ),
+}
+
+_HARNESS = """
+import json, sys, time
+start = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(code: str) -> dict:
+    """Run the code in a fresh interpreter and return its timing."""
+    harness = _HARNESS.format(code=code, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", harness], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        times = [run["seconds"] * 1000 for run in runs]
+        loaded = ", ".join(runs[-1]["loaded"]) or "none"
+
+        print(f"{name:<18} median {statistics.median(times):7.1f} ms   min {min(times):7.1f} ms   heavy modules: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Run every benchmark on fixed-seed workloads and print the results as JSON,
+so that a regression in any hot path shows up as a number.
+
+    $ python3 benchmarks/suite.py [--repeat N] [--seed S] [--only NAME ...] [--output FILE]
+    $ python3 benchmarks/suite.py --compare baseline.json [--tolerance 0.2]
+
+With --compare, the results are also checked against an earlier run, and the
+exit status is 1 if any benchmark got slower by more than the tolerance.
+"""
+from argparse import ArgumentParser
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from batch import make_observations
+from cli import COMMANDS as CLI_COMMANDS, run_once as run_cli
+from startup import SCENARIOS as STARTUP_SCENARIOS, run_scenario
+from ivchecker.engine import Characteristic, Nature, Stat, get_all_pokemon_names, get_basestats
+from ivchecker.runners import check_ivs, check_ivs_batch, get_ranges
+from ivchecker.utils import config
+
+ROOT = Path(__file__).parent.parent
+
+
+@dataclass
+class Benchmark:
+    """A function to time, called once per case of its workload.
+
+    A self-timed function returns its own time in seconds (e.g., measured inside
+    a subprocess, without the interpreter's startup). Each call can count as
+    several operations, e.g., one per row of a batch.
+    """
+    name: str
+    function: Callable
+    cases: list[tuple]
+    ops_per_call: int = 1
+    self_timed: bool = False
+
+
+def check_cases(rows: int, seed: int, characteristic: bool, hidden_power: bool) -> list[tuple]:
+    """Arguments for check_ivs, drawn from consistent observations of random Pokémon."""
+    observations = make_observations(rows, seed)
+    cases = []
+    for i in range(rows):
+        row = {column: values[i] for column, values in observations.items()}
+        char = row["characteristic"] if characteristic else ""
+        cases.append((
+            row["pokemon"], row["generation"], row["level"],
+            tuple(row[f"stat_{stat.value}"] for stat in Stat),
+            row["nature"],
+            tuple(row[f"ev_{stat.value}"] for stat in Stat),
+            Characteristic.get(char) if char else None,
+            row["hidden_power_type"] if hidden_power else "",
+        ))
+
+    return cases
+
+
+def lookup_cases(rows: int, seed: int, generations: range) -> list[tuple]:
+    """(pokemon, generation, level) triples, with names in the mixed case that users type."""
+    rng = random.Random(seed)
+    names = get_all_pokemon_names()
+    return [(rng.choice(names).title(), rng.choice(generations), rng.randint(1, 100)) for _ in range(rows)]
+
+
+def typo(name: str, rng: random.Random) -> str:
+    """Misspell a name by swapping, dropping or doubling one of its letters."""
+    i = rng.randrange(len(name) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    if kind == 1:
+        return name[:i] + name[i + 1:]
+    return name[:i] + name[i] + name[i:]
+
+
+def fuzzy_miss(pokemon: str) -> None:
+    try:
+        get_basestats(pokemon=pokemon, generation=config.generations.most_recent)
+    except ValueError:
+        pass
+
+
+def build_benchmarks(seed: int) -> list[Benchmark]:
+    rows, batch_rows = 2000, 20000
+    rng = random.Random(seed)
+    current = config.generations.most_recent
+    natures = [nature.name for nature in Nature.read_all()]
+    names = [name for name, _, _ in lookup_cases(rows, seed, range(current, current + 1))]
+
+    benchmarks = [
+        Benchmark("check_ivs", check_ivs, check_cases(rows, seed, characteristic=False, hidden_power=False)),
+        Benchmark("check_ivs+characteristic", check_ivs, check_cases(rows, seed, characteristic=True, hidden_power=False)),
+        Benchmark("check_ivs+hidden_power", check_ivs, check_cases(rows, seed, characteristic=False, hidden_power=True)),
+        Benchmark("check_ivs+both_filters", check_ivs, check_cases(rows, seed, characteristic=True, hidden_power=True)),
+        Benchmark("check_ivs_batch (per row)", check_ivs_batch, [(make_observations(batch_rows, seed),)], ops_per_call=batch_rows),
+        Benchmark("get_ranges", get_ranges, lookup_cases(rows, seed, range(3, current + 1))),
+        Benchmark("get_basestats (current gen)", get_basestats, [case[:2] for case in lookup_cases(rows, seed, range(current, current + 1))]),
+        Benchmark("get_basestats (old gens)", get_basestats, [case[:2] for case in lookup_cases(rows, seed, range(3, 6))]),
+        Benchmark("Nature.from_name", Nature.from_name, [(rng.choice((str.lower, str.upper, str.title))(rng.choice(natures)),) for _ in range(rows)]),
+        Benchmark("fuzzy miss", fuzzy_miss, [(typo(name, rng),) for name in names[:200]]),
+    ]
+
+    for name, code in STARTUP_SCENARIOS.items():
+        benchmarks.append(Benchmark(f"cold: {name}", lambda code: run_scenario(code)["seconds"], [(code,)], self_timed=True))
+
+    for name, command in CLI_COMMANDS.items():
+        benchmarks.append(Benchmark(f"cli: {name}", lambda command: run_cli(command)[0], [(command,)], self_timed=True))
+
+    return benchmarks
+
+
+def measure(benchmark: Benchmark, repeat: int) -> dict:
+    """Time passes over the whole workload, reporting the median, etc. time per operation."""
+    ops = benchmark.ops_per_call * len(benchmark.cases)
+    if not benchmark.self_timed:
+        # one untimed pass, so that lazily built indexes aren't counted against the first
+        for args in benchmark.cases:
+            benchmark.function(*args)
+
+    passes = []
+    for _ in range(max(repeat, 2)):
+        start = time.perf_counter()
+        if benchmark.self_timed:
+            elapsed = sum(benchmark.function(*args) for args in benchmark.cases)
+        else:
+            for args in benchmark.cases:
+                benchmark.function(*args)
+            elapsed = time.perf_counter() - start
+
+        passes.append(elapsed / ops * 1e6)
+
+    return {
+        "name": benchmark.name,
+        "ops": ops,
+        "passes": len(passes),
+        "median_us": round(statistics.median(passes), 3),
+        "min_us": round(min(passes), 3),
+        "stdev_us": round(statistics.stdev(passes), 3),
+        "ops_per_second": round(1e6 / statistics.median(passes), 1),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Return a description of each benchmark that is slower than in the baseline by more than the tolerance."""
+    before = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = before.get(result["name"])
+        if old is None:
+            continue
+
+        ratio = result["median_us"] / old["median_us"]
+        result["baseline_median_us"] = old["median_us"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{result['name']}: {old['median_us']} -> {result['median_us']} us ({ratio:.2f}x)")
+
+    return regressions
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", default=(), metavar="NAME", help="run only benchmarks whose names start with one of these")
+    parser.add_argument("--output", type=Path, help="also write the results to this file")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="a results file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="how much slower (as a fraction) counts as a regression")
+    args = parser.parse_args()
+
+    # warm up the data cache and the in-process tables, so that every benchmark starts the same way
+    run_cli(CLI_COMMANDS["check"])
+    benchmarks = [b for b in build_benchmarks(args.seed) if not args.only or b.name.startswith(tuple(args.only))]
+
+    results = []
+    for benchmark in benchmarks:
+        results.append(measure(benchmark, args.repeat))
+        print(f"{benchmark.name:<30} {results[-1]['median_us']:12.3f} us", file=sys.stderr)
+
+    report = {"environment": environment(), "seed": args.seed, "results": results}
+
+    regressions = []
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
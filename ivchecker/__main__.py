@@ -0,0 +1,5 @@
+import sys
+
+from ivchecker.cli import main
+
+sys.exit(main())
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import numpy as np
+
+# bump whenever the layout of the cached arrays changes
+CACHE_VERSION = 2
+
+MANIFEST = "manifest.json"
+
+
+def _stamp(path: Path) -> dict[str, int]:
+    stat = path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _write_atomically(path: Path, write) -> None:
+    """Write a file through a temporary file of its own, so concurrent writers never share one."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+        temp = Path(f.name)
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            temp.unlink(missing_ok=True)
+            raise
+    try:
+        os.replace(temp, path)
+    except OSError:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+class ArrayCache:
+    """A directory of .npy files compiled from some source files.
+
+    The manifest records each source's mtime, size and hash. The cache is stale
+    once a source's hash changes; a source that was only touched just has its
+    new mtime recorded.
+    """
+
+    def __init__(self, directory: Path, sources: list[Path]):
+        self.directory = directory
+        self.sources = sources
+
+    def load(self) -> dict[str, np.ndarray] | None:
+        """Return the cached arrays, memory-mapped read-only, or None if the cache is missing or stale."""
+        try:
+            manifest = json.loads((self.directory / MANIFEST).read_text())
+            recorded: dict[str, dict] = manifest["sources"]
+
+            if manifest["version"] != CACHE_VERSION or set(recorded) != {str(source) for source in self.sources}:
+                return None
+
+            touched = False
+            for source in self.sources:
+                entry, stamp = recorded[str(source)], _stamp(source)
+                if all(entry[key] == value for key, value in stamp.items()):
+                    continue
+
+                if _digest(source) != entry["sha256"]:
+                    return None
+
+                entry.update(stamp)
+                touched = True
+
+            arrays = {name: np.load(self.directory / f"{name}.npy", mmap_mode="r") for name in manifest["arrays"]}
+        except (OSError, KeyError, ValueError):
+            return None
+
+        if touched:
+            self._write_manifest(manifest)
+
+        return arrays
+
+    def save(self, arrays: dict[str, np.ndarray]) -> None:
+        """Replace the cached arrays, recording the current state of the sources.
+        If the directory can't be written to, we just go without a cache.
+        """
+        manifest = {
+            "version": CACHE_VERSION,
+            "arrays": list(arrays),
+            "sources": {str(source): {**_stamp(source), "sha256": _digest(source)} for source in self.sources},
+        }
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            # drop the manifest first, so a half-written cache is never trusted
+            (self.directory / MANIFEST).unlink(missing_ok=True)
+
+            for name, array in arrays.items():
+                _write_atomically(self.directory / f"{name}.npy", lambda f: np.save(f, array))
+        except OSError:
+            return
+
+        self._write_manifest(manifest)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        text = json.dumps(manifest, indent=2).encode()
+        try:
+            _write_atomically(self.directory / MANIFEST, lambda f: f.write(text))
+        except OSError:
+            pass
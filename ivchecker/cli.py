@@ -0,0 +1,227 @@
+from __future__ import annotations
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from contextlib import nullcontext
+from itertools import islice
+import json
+from typing import Sequence
+
+from ivchecker import instrument
+from ivchecker.constraints import JudgedRange
+from ivchecker.engine import MAX_TOTAL_EVS, Characteristic, Stat, get_basestats
+from ivchecker.ivset import IVSet
+from ivchecker.runners import check_ivs, check_ivs_all_natures, check_ivs_unknown_evs, get_ranges
+from ivchecker.search import find_species
+from ivchecker.spreads import count_spreads, iter_spreads
+from ivchecker.utils import SixInts, config, format_ivs
+
+# This module backs `python3 -m ivchecker`, for scripts and servers without a
+# display, so it must never import tkinter or PIL (i.e., gui or tabinit).
+
+
+def _level(value: str) -> int:
+    try:
+        level = int(value)
+    except ValueError:
+        level = 0
+    if not 1 <= level <= 100:
+        raise ArgumentTypeError(f"level must be a whole number from 1 to 100, not {value}")
+    return level
+
+
+def build_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="ivchecker", description="Check Pokémon IVs without the GUI. Results are printed as JSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(command: ArgumentParser) -> None:
+        command.add_argument("pokemon")
+        command.add_argument("-g", "--generation", type=int, default=config.generations.most_recent)
+        command.add_argument("-l", "--level", type=_level, required=True)
+        command.add_argument("--trace", action="store_true", help="include per-stage timings and counters in the output")
+
+    check = commands.add_parser("check", help="find the possible IVs (the Check IVs tab)")
+    add_common(check)
+    check.add_argument("-s", "--stats", type=int, nargs=6, required=True, metavar=tuple(Stat.names()))
+    evs = check.add_mutually_exclusive_group()
+    evs.add_argument("-e", "--evs", type=int, nargs=6, default=[0] * 6, metavar=tuple(Stat.names()))
+    evs.add_argument("-u", "--unknown-evs", action="store_true", help="solve for the EVs as well, giving the EVs possible with each IV")
+    check.add_argument("--no-ev-cap", action="store_true", help=f"with --unknown-evs, don't limit the total EVs to {MAX_TOTAL_EVS}")
+    check.add_argument("-n", "--nature", default="", help='a name, or a label as shown in the GUI, e.g., "Jolly (+Spe/-SpA)". '
+                                                         'If not given, every nature is tried, and the IVs are given per nature.')
+    check.add_argument("-c", "--characteristic", default="")
+    check.add_argument("-t", "--hp-type", default="")
+    check.add_argument("-j", "--judge", nargs=2, action="append", default=[], metavar=("STAT", "VERDICT"),
+                       help='what the IV judge said about a stat, e.g., "-j Atk fantastic". Can be repeated.')
+    check.add_argument("--spreads", type=int, default=0, metavar="N",
+                       help="also count the full IV spreads consistent with everything, and list the N with the highest totals")
+
+    ranges = commands.add_parser("ranges", help="show base stats and stat ranges (the Show Ranges tab)")
+    add_common(ranges)
+
+    search = commands.add_parser("search", help="find every Pokémon (or form) that could have these stats")
+    search.add_argument("-g", "--generation", type=int, default=config.generations.most_recent)
+    search.add_argument("-l", "--level", type=_level, required=True)
+    search.add_argument("-s", "--stats", type=int, nargs=6, required=True, metavar=tuple(Stat.names()))
+    search.add_argument("-e", "--evs", type=int, nargs=6, default=[0] * 6, metavar=tuple(Stat.names()))
+    search.add_argument("-n", "--nature", default="", help="if not given, any nature is allowed")
+    search.add_argument("--trace", action="store_true", help="include per-stage timings and counters in the output")
+
+    serve = commands.add_parser("serve", help="answer requests over HTTP/JSON on localhost, keeping the engine warm")
+    serve.add_argument("-p", "--port", type=int, default=8765)
+    serve.add_argument("--batch-window-ms", type=float, default=2.0, help="how long to wait for more check requests to batch together")
+    serve.add_argument("--max-batch", type=int, default=512)
+
+    return parser
+
+
+def run_check(args: Namespace) -> dict:
+    characteristic = Characteristic.get(args.characteristic) if args.characteristic else None
+    judged = [JudgedRange.from_judgement(parse_stat(stat), verdict) for stat, verdict in args.judge]
+    if (judged or args.spreads) and (args.unknown_evs or not args.nature):
+        raise ValueError(f"{'--judge' if judged else '--spreads'} needs a nature and known EVs.")
+
+    if not args.nature:
+        if args.unknown_evs:
+            raise ValueError("--unknown-evs needs a nature.")
+
+        by_nature = check_ivs_all_natures(
+            pokemon=args.pokemon,
+            generation=args.generation,
+            level=args.level,
+            actual_stats=tuple(args.stats),
+            evs=tuple(args.evs),
+            characteristic=characteristic,
+            hidden_power_type=args.hp_type
+        )
+        return {"natures": {name: ivs_result(ivs) for name, ivs in by_nature.items()}}
+
+    if args.unknown_evs:
+        evs = check_ivs_unknown_evs(
+            pokemon=args.pokemon,
+            generation=args.generation,
+            level=args.level,
+            actual_stats=tuple(args.stats),
+            nature_name=args.nature.partition(" (")[0],
+            characteristic=characteristic,
+            hidden_power_type=args.hp_type,
+            ev_cap=None if args.no_ev_cap else MAX_TOTAL_EVS
+        )
+        return {**ivs_result([IVSet.of(by_iv) for by_iv in evs]), **evs_result(evs)}
+
+    ivs = check_ivs(
+        pokemon=args.pokemon,
+        generation=args.generation,
+        level=args.level,
+        actual_stats=tuple(args.stats),
+        nature_name=args.nature.partition(" (")[0],
+        evs=tuple(args.evs),
+        characteristic=characteristic,
+        hidden_power_type=args.hp_type,
+        constraints=judged
+    )
+
+    if args.spreads:
+        return {**ivs_result(ivs), **spreads_result(ivs, characteristic, args.hp_type, args.spreads)}
+    return ivs_result(ivs)
+
+
+def parse_stat(name: str) -> Stat:
+    """Find a stat by its name as shown in the GUI (e.g., "SpA"), in any case."""
+    for stat in Stat:
+        if stat.value.lower() == name.lower():
+            return stat
+
+    raise ValueError(f"Unknown stat: {name}. Expected one of {', '.join(Stat.names())}.")
+
+
+def run_ranges(args: Namespace) -> dict:
+    basestats = get_basestats(pokemon=args.pokemon, generation=args.generation)
+    ranges = get_ranges(pokemon=args.pokemon, generation=args.generation, level=args.level)
+
+    return {**basestats_result(basestats), **ranges_result(ranges)}
+
+
+def ivs_result(ivs: Sequence[IVSet]) -> dict:
+    """Describe the possible IVs of each stat, as a JSON-ready dict."""
+    return {
+        "ivs": {stat.value: list(opts) for stat, opts in zip(Stat, ivs)},
+        "formatted": {stat.value: format_ivs(opts) for stat, opts in zip(Stat, ivs)},
+    }
+
+
+def spreads_result(ivs: Sequence[IVSet], characteristic: Characteristic | None, hidden_power_type: str, limit: int) -> dict:
+    """Count the consistent spreads, and list up to `limit` of them, highest total first."""
+    best = iter_spreads(ivs, characteristic, hidden_power_type, order="total", reverse=True)
+    return {
+        "spread_count": count_spreads(ivs, characteristic, hidden_power_type),
+        "spreads": [dict(zip(Stat.names(), spread)) for spread in islice(best, limit)],
+    }
+
+
+def evs_result(evs: Sequence[dict[int, range]]) -> dict:
+    """Describe the EVs possible with each IV of each stat, as a JSON-ready dict."""
+    return {
+        "evs": {
+            stat.value: {iv: [ev_range.start, ev_range.stop - 1] for iv, ev_range in by_iv.items()}
+            for stat, by_iv in zip(Stat, evs)
+        },
+    }
+
+
+def basestats_result(basestats: SixInts) -> dict:
+    """Describe a Pokémon's base stats, as a JSON-ready dict."""
+    return {"basestats": dict(zip(Stat.names(), basestats)), "bst": sum(basestats)}
+
+
+def ranges_result(ranges: Sequence[tuple[int, int, int]]) -> dict:
+    """Describe the range of each stat, as a JSON-ready dict."""
+    return {
+        "ranges": {
+            stat.value: {"min": minimum, "max_0ev": max0, "max_252ev": max252}
+            for stat, (minimum, max0, max252) in zip(Stat, ranges)
+        },
+    }
+
+
+def run_search(args: Namespace) -> dict:
+    matches = find_species(
+        level=args.level,
+        actual_stats=tuple(args.stats),
+        evs=tuple(args.evs),
+        nature_name=args.nature.partition(" (")[0],
+        generation=args.generation
+    )
+
+    return {"matches": matches}
+
+
+COMMANDS = {
+    "check": run_check,
+    "ranges": run_ranges,
+    "search": run_search,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "serve":
+        from ivchecker.service import serve
+        serve(port=args.port, batch_window=args.batch_window_ms / 1000, max_batch=args.max_batch)
+        return 0
+
+    with instrument.recording() if args.trace else nullcontext() as recorder:
+        try:
+            result = COMMANDS[args.command](args)
+        except ValueError as e:
+            result = {"error": str(e)}
+
+    if recorder is not None:
+        result["trace"] = {"summary": recorder.summary(), "events": recorder.export_events()}
+
+    if "error" in result:
+        print(json.dumps(result, ensure_ascii=False))
+        return 1
+
+    request = {key: getattr(args, key) for key in ("pokemon", "generation", "level") if hasattr(args, key)}
+    print(json.dumps({**request, **result}, ensure_ascii=False))
+    return 0
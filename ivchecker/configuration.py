@@ -6,6 +6,8 @@ import yaml
 @dataclass
 class UIConfig:
     textbox_relief: str
+    live_update: bool = False
+    live_update_delay_ms: int = 400
 
 
 @dataclass
@@ -21,6 +23,7 @@ class PathConfig:
     natures: str
     statchanges: str
     icon: str
+    cache: str = "cache"
 
 
 @dataclass
@@ -0,0 +1,232 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, ClassVar, Iterable
+
+from ivchecker import instrument
+from ivchecker.engine import HP_PATTERNS, ODD_PATTERNS, Characteristic, HPType, Nature, Stat
+from ivchecker.ivset import EVEN_IVS, ODD_IVS, IVSet
+from ivchecker.utils import SixInts
+
+# the possible IVs of each stat, always in Stat order
+Domains = dict[Stat, IVSet]
+
+# no evidence yet
+_EVERY_IV = {stat: IVSet.all() for stat in Stat}
+
+# the IVs behind each verdict of the IV judge (from Gen 7 on)
+JUDGE_RANGES = {
+    "best": range(31, 32),
+    "fantastic": range(30, 31),
+    "very good": range(26, 30),
+    "pretty good": range(16, 26),
+    "decent": range(1, 16),
+    "no good": range(0, 1),
+}
+
+
+class Constraint(ABC):
+    """One piece of evidence about a Pokémon's IVs, which narrows the IV domains.
+
+    A unary constraint only looks at the stats it narrows, so it never has
+    more to remove once applied; the others relate several stats, and are
+    applied again whenever another constraint narrows their inputs. Applying
+    any constraint twice in a row must not narrow the domains further.
+
+    The selectivity is a rough estimate of the fraction of IV spreads that
+    satisfy the constraint. Unary constraints run first, since they are cheap
+    and the others feed on what they remove, and each kind runs most
+    selective first.
+    """
+    name: ClassVar[str]
+    unary: ClassVar[bool] = True
+
+    @property
+    @abstractmethod
+    def selectivity(self) -> float:
+        ...
+
+    @abstractmethod
+    def apply(self, domains: Domains) -> Domains:
+        ...
+
+
+@dataclass
+class ObservedStats(Constraint):
+    """The six stats seen in game, solved for the IVs by one of the runners' stat filters."""
+    name: ClassVar[str] = "stats"
+
+    filter_stats: Callable[[int, SixInts, SixInts, SixInts, Nature], Domains]
+    level: int
+    basestats: SixInts
+    actual_stats: SixInts
+    evs: SixInts
+    nature: Nature
+
+    @property
+    def selectivity(self) -> float:
+        # each stat value comes from about 100 / level consecutive IVs
+        return min(1.0, 100 / max(self.level, 1) / 32) ** 6
+
+    def apply(self, domains: Domains) -> Domains:
+        matches = self.filter_stats(self.level, self.basestats, self.actual_stats, self.evs, self.nature)
+        if domains is _EVERY_IV:
+            return matches
+        return {stat: opts & match for (stat, opts), match in zip(domains.items(), matches.values())}
+
+
+@dataclass
+class KnownCharacteristic(Constraint):
+    """The characteristic fixes the highest IV's residue mod 5, and caps every other IV."""
+    name: ClassVar[str] = "characteristic"
+    unary: ClassVar[bool] = False
+
+    characteristic: Characteristic
+
+    @property
+    def selectivity(self) -> float:
+        # one residue in five, and the stat is the highest about one time in six
+        return 1 / 30
+
+    def apply(self, domains: Domains) -> Domains:
+        # The characteristic determines the residue mod 5
+        high = domains[self.characteristic.high_stat].congruent(self.characteristic.residue, 5)
+
+        # And we also know that no other IV can exceed this one.
+        if not high:
+            raise ValueError(f"No possible IVs found. Check entered stats for errors.")
+        cap = high.max
+
+        return {stat: high if stat == self.characteristic.high_stat else opts.at_most(cap)
+                for stat, opts in domains.items()}
+
+
+@dataclass
+class KnownHiddenPower(Constraint):
+    """The hidden power type, which depends on the parity of every IV."""
+    name: ClassVar[str] = "hidden_power"
+    unary: ClassVar[bool] = False
+
+    hp_type: HPType
+
+    @classmethod
+    def from_name(cls, name: str) -> KnownHiddenPower:
+        return cls(HPType.from_name(name))
+
+    @property
+    def selectivity(self) -> float:
+        return HP_PATTERNS[self.hp_type].bit_count() / 64
+
+    def apply(self, domains: Domains) -> Domains:
+        # Start from the parity patterns giving this type, and rule out those
+        # needing a parity that some stat doesn't have.
+        patterns = HP_PATTERNS[self.hp_type]
+        for opts, odd in zip(domains.values(), ODD_PATTERNS):
+            if not opts.mask & ODD_IVS:
+                patterns &= ~odd
+            if not opts.mask & EVEN_IVS:
+                patterns &= odd
+
+        # Then each stat keeps the parities used by some remaining pattern.
+        return {
+            stat: IVSet(opts.mask & ((EVEN_IVS if patterns & ~odd else 0) | (ODD_IVS if patterns & odd else 0)))
+            for (stat, opts), odd in zip(domains.items(), ODD_PATTERNS)
+        }
+
+
+@dataclass
+class JudgedRange(Constraint):
+    """A range one IV is known to be in, e.g., from the IV judge."""
+    name: ClassVar[str] = "range"
+
+    stat: Stat
+    ivs: range
+
+    @classmethod
+    def from_judgement(cls, stat: Stat, judgement: str) -> JudgedRange:
+        try:
+            return cls(stat, JUDGE_RANGES[judgement.strip().lower()])
+        except KeyError:
+            raise ValueError(f"Unknown IV judgement: {judgement}") from None
+
+    @property
+    def selectivity(self) -> float:
+        return len(self.ivs) / 32
+
+    def apply(self, domains: Domains) -> Domains:
+        return {**domains, self.stat: domains[self.stat] & IVSet.from_range(self.ivs)}
+
+
+@dataclass
+class KnownParity(Constraint):
+    """Whether one IV is odd or even."""
+    name: ClassVar[str] = "parity"
+
+    stat: Stat
+    odd: bool
+
+    @property
+    def selectivity(self) -> float:
+        return 1 / 2
+
+    def apply(self, domains: Domains) -> Domains:
+        opts = domains[self.stat]
+        return {**domains, self.stat: opts.odds if self.odd else opts.evens}
+
+
+def _order(constraint: Constraint) -> tuple[bool, float]:
+    return not constraint.unary, constraint.selectivity
+
+
+def propagate(constraints: Iterable[Constraint], domains: Domains | None = None) -> Domains:
+    """Narrow the domains (by default, every IV for every stat) until no constraint removes anything more.
+
+    Propagation stops as soon as some stat has no IVs left, so that stat's
+    domain (and whatever the others were narrowed to so far) comes back.
+    """
+    # Constraints return new domains rather than changing the ones they're given.
+    domains = domains if domains is not None else _EVERY_IV
+    ordered = list(constraints)
+    if len(ordered) > 1:
+        ordered.sort(key=_order)
+    relational = [constraint for constraint in ordered if not constraint.unary]
+
+    # Each probe costs one branch unless instrumentation is on (see ivchecker.instrument).
+    recorder = instrument.active
+
+    # 1: Apply everything once, remembering which constraint last narrowed anything
+    last = None
+    for constraint in ordered:
+        narrowed = constraint.apply(domains)
+        if recorder is not None:
+            recorder.stage(constraint.name, narrowed)
+
+        # (anything counts as narrowing the starting point, which saves comparing with it)
+        if domains is _EVERY_IV or narrowed != domains:
+            domains, last = narrowed, constraint
+            if not all(domains.values()):
+                return domains
+
+    if last is None:
+        # (nothing ran, so these could be _EVERY_IV itself, which mustn't be handed out)
+        return dict(domains)
+
+    # 2: Go round the relational constraints until each has seen the latest
+    # domains. The last one to narrow them has nothing more to remove.
+    while True:
+        changed = False
+        for constraint in relational:
+            if constraint is last:
+                return domains
+
+            narrowed = constraint.apply(domains)
+            if recorder is not None:
+                recorder.stage(constraint.name, narrowed)
+
+            if narrowed != domains:
+                domains, last, changed = narrowed, constraint, True
+                if not all(domains.values()):
+                    return domains
+
+        if not changed:
+            return domains
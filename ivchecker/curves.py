@@ -0,0 +1,75 @@
+from __future__ import annotations
+import numpy as np
+
+from ivchecker.engine import MAX_EV, Stat, calculate_stat, invert_raw
+from ivchecker.kernel import IS_HP, calculate_stats
+from ivchecker.utils import SixInts
+
+# every level
+LEVELS = np.arange(1, 101)
+
+# only every 4th EV changes a stat, so these are the EV investments worth making
+EV_STEPS = np.arange(0, MAX_EV + 1, 4)
+
+# the modifiers a nature can apply to a stat (HP ignores them)
+MODIFIERS = np.array([0.9, 1.0, 1.1])
+
+
+def stat_curves(basestats: SixInts, ivs: SixInts, levels=LEVELS, evs=EV_STEPS, modifiers=MODIFIERS) -> np.ndarray:
+    """Return a (levels, evs, modifiers, 6) array of a Pokémon's stats at
+    every combination of level, EVs (put into each stat) and nature modifier,
+    with the stats in `Stat` order.
+    """
+    levels, evs, modifiers = (np.asarray(x) for x in (levels, evs, modifiers))
+    return calculate_stats(
+        levels[:, None, None, None], np.asarray(basestats), np.asarray(ivs),
+        evs[None, :, None, None], modifiers[None, None, :, None], IS_HP
+    )
+
+
+def min_evs(level: int, base: int, iv: int, target: int, nature: float, stat: Stat) -> int | None:
+    """Return the fewest EVs for which the stat is at least the target, or None if even 252 EVs fall short.
+
+    Solved by inverting the stat formula, like `engine.invert_stat_ev`.
+    """
+    lo, _ = invert_raw(level, target, nature, stat)
+    needed = max(lo - 2 * base - iv, 0) * 4
+
+    return needed if needed <= MAX_EV else None
+
+
+def wasted_evs(level: int, base: int, iv: int, ev: int, nature: float, stat: Stat) -> int:
+    """Return how many of the EVs could be taken away without lowering the stat,
+    i.e., how far past the last breakpoint they go.
+    """
+    reached = calculate_stat(level, base, iv, ev, nature, stat)
+    return ev - min_evs(level, base, iv, reached, nature, stat)
+
+
+def breakpoints(level: int, base: int, iv: int, nature: float, stat: Stat) -> np.ndarray:
+    """Return the EVs at which the stat goes up, each with the stat it goes up to, as a (breakpoints, 2) array."""
+    stats = calculate_stats(level, base, iv, EV_STEPS, nature, stat == Stat.HP)
+    rises = np.flatnonzero(np.diff(stats)) + 1
+
+    return np.column_stack([EV_STEPS[rises], stats[rises]])
+
+
+def min_evs_batch(level, basestats, ivs, targets, modifiers) -> np.ndarray:
+    """Vectorized `min_evs`. `level` has shape (...), and the other arguments
+    have shape (..., 6), with the stats in `Stat` order. Returns the fewest
+    EVs reaching each target, with -1 where 252 EVs aren't enough.
+
+    Every EV step is tried at once, and the first that reaches the target is kept.
+    """
+    level = np.asarray(level)[..., None, None]
+    base, iv, target, nature = (np.asarray(x)[..., None] for x in (basestats, ivs, targets, modifiers))
+
+    reached = calculate_stats(level, base, iv, EV_STEPS, nature, IS_HP[:, None]) >= target
+    return np.where(reached.any(axis=-1), EV_STEPS[np.argmax(reached, axis=-1)], -1)
+
+
+def wasted_evs_batch(level, basestats, ivs, evs, modifiers) -> np.ndarray:
+    """Vectorized `wasted_evs`, with arguments shaped as in `min_evs_batch`."""
+    level = np.asarray(level)
+    reached = calculate_stats(level[..., None], basestats, ivs, evs, modifiers, IS_HP)
+    return np.asarray(evs) - min_evs_batch(level, basestats, ivs, reached, modifiers)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Mapping, Sequence
+import numpy as np
+
+from ivchecker import instrument
+from ivchecker.cache import ArrayCache
+from ivchecker.configuration import PathConfig
+from ivchecker.shared import attached_tables
+from ivchecker.utils import ROOT, SixInts, config
+
+
+class SortedIndex(Mapping[str, int]):
+    """Maps lowercased names to their rows by a binary search of the sorted
+    names. Unlike a dict, it can be read straight from an array on disk or
+    in shared memory, without a copy in every process.
+    """
+
+    def __init__(self, keys: np.ndarray, rows: np.ndarray):
+        self.keys = keys
+        self.rows = rows
+
+    @staticmethod
+    def arrays(names: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the sorted keys and their rows for the given names."""
+        keys = np.char.lower(np.asarray(names, dtype=str))
+        rows = np.argsort(keys, kind="stable")
+        return keys[rows], rows.astype(np.int32)
+
+    def __getitem__(self, key: str) -> int:
+        i = int(self.keys.searchsorted(key))
+        if i == len(self.keys) or self.keys[i] != key:
+            raise KeyError(key)
+        return int(self.rows[i])
+
+    def __iter__(self) -> Iterator[str]:
+        # in row order, like the dict it stands in for
+        return (str(self.keys[i]) for i in np.argsort(self.rows))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class SpeciesStats(Mapping[str, SixInts]):
+    """The rows of a (species, 6) array of stats, looked up by lowercased name."""
+
+    def __init__(self, index: SortedIndex, stats: np.ndarray):
+        self.index = index
+        self.stats = stats
+
+    def __getitem__(self, key: str) -> SixInts:
+        return tuple(self.stats[self.index[key]].tolist())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+
+@dataclass
+class Dataset:
+    """The reference data files, parsed once and indexed by lowercased name.
+
+    When loaded from arrays, the species names and base stats stay in those
+    arrays, and are looked up in place (see `SortedIndex`).
+    """
+    species_names: Sequence[str]
+    basestats: Mapping[str, SixInts]
+    stat_changes: dict[str, dict[int, SixInts]]
+    natures: dict[str, tuple[str, str, str]]
+    characteristics: dict[str, tuple[str, str, int]]
+
+    @classmethod
+    def from_csv(cls, root: Path, paths: PathConfig) -> Dataset:
+        """Parse every data file named in the path configuration."""
+        # pandas is slow to import, so only do so once there's data to parse
+        import pandas as pd
+
+        basestats_df = pd.read_csv(root / paths.basestats)
+        species_names = basestats_df["Name"].tolist()
+        basestats = {
+            name.lower(): tuple(map(int, stats))
+            for name, *stats in basestats_df.itertuples(index=False)
+        }
+
+        stat_changes: dict[str, dict[int, SixInts]] = {}
+        changes_df = pd.read_csv(root / paths.statchanges, index_col=0)
+        for name, last_gen, *stats in changes_df.itertuples(index=False):
+            stat_changes.setdefault(name.lower(), {})[int(last_gen)] = tuple(map(int, stats))
+
+        natures = {
+            name.lower(): (name, raised, lowered)
+            for name, _, raised, lowered in pd.read_csv(root / paths.natures).itertuples(index=False)
+        }
+
+        characteristics = {
+            description.lower(): (description, high, int(residue))
+            for description, high, residue in pd.read_csv(root / paths.characteristics).itertuples(index=False)
+        }
+
+        return cls(species_names, basestats, stat_changes, natures, characteristics)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> Dataset:
+        """Rebuild the dataset from the arrays given by `to_arrays`.
+
+        Only the small tables are copied out; the species stay in the arrays.
+        """
+        species_names = arrays["species"]
+        basestats = SpeciesStats(SortedIndex(arrays["species_keys"], arrays["species_rows"]), arrays["basestats"])
+
+        stat_changes: dict[str, dict[int, SixInts]] = {}
+        changes = zip(arrays["change_species"].tolist(), arrays["change_last_gen"].tolist(), arrays["change_stats"].tolist())
+        for name, last_gen, stats in changes:
+            stat_changes.setdefault(name.lower(), {})[last_gen] = tuple(stats)
+
+        natures = {name.lower(): (name, raised, lowered) for name, raised, lowered in arrays["natures"].tolist()}
+
+        characteristics = {
+            description.lower(): (description, high, residue)
+            for description, high, residue in zip(
+                arrays["characteristic_descriptions"].tolist(),
+                arrays["characteristic_high"].tolist(),
+                arrays["characteristic_residue"].tolist(),
+            )
+        }
+
+        return cls(species_names, basestats, stat_changes, natures, characteristics)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Flatten the dataset into named arrays, e.g., for caching on disk."""
+        changes = [(name, last_gen, stats) for name, by_gen in self.stat_changes.items() for last_gen, stats in by_gen.items()]
+        characteristics = list(self.characteristics.values())
+        species_keys, species_rows = SortedIndex.arrays(self.species_names)
+
+        return {
+            "species": np.array(self.species_names),
+            "species_keys": species_keys,
+            "species_rows": species_rows,
+            "basestats": np.array(list(self.basestats.values()), dtype=np.int16).reshape(-1, 6),
+            "change_species": np.array([name for name, _, _ in changes]),
+            "change_last_gen": np.array([last_gen for _, last_gen, _ in changes], dtype=np.int16),
+            "change_stats": np.array([stats for _, _, stats in changes], dtype=np.int16).reshape(-1, 6),
+            "natures": np.array(list(self.natures.values())).reshape(-1, 3),
+            "characteristic_descriptions": np.array([description for description, _, _ in characteristics]),
+            "characteristic_high": np.array([high for _, high, _ in characteristics]),
+            "characteristic_residue": np.array([residue for _, _, residue in characteristics], dtype=np.int8),
+        }
+
+    def get_nature(self, name: str) -> tuple[str, str, str]:
+        """Return the (name, raised, lowered) record for the given nature."""
+        return _lookup(self.natures, name)
+
+    def get_characteristic(self, description: str) -> tuple[str, str, int]:
+        """Return the (description, high stat, residue) record for the given characteristic."""
+        return _lookup(self.characteristics, description)
+
+
+def _lookup(index: dict, value: str):
+    try:
+        return index[value.lower()]
+    except KeyError:
+        raise ValueError(f"could not find value: {value}") from None
+
+
+@lru_cache(maxsize=None)
+def get_dataset() -> Dataset:
+    """Return the process-wide dataset, loading it on first use.
+
+    The parsed data files are kept in a compiled cache (see `config.paths.cache`),
+    so that a new process only has to parse them again after they change. A
+    process attached to shared tables (see `ivchecker.shared`) reads them from there.
+    """
+    shared = attached_tables()
+    if shared is not None:
+        instrument.count("dataset loads (shared memory)")
+        return Dataset.from_arrays(shared.arrays)
+
+    paths = config.paths
+    sources = [ROOT / path for path in (paths.basestats, paths.statchanges, paths.natures, paths.characteristics)]
+    cache = ArrayCache(ROOT / paths.cache, sources)
+
+    arrays = cache.load()
+    if arrays is not None:
+        instrument.count("dataset loads (cache)")
+        return Dataset.from_arrays(arrays)
+
+    instrument.count("dataset loads (csv)")
+    dataset = Dataset.from_csv(ROOT, paths)
+    cache.save(dataset.to_arrays())
+    return dataset
@@ -1,11 +1,23 @@
 from __future__ import annotations
-from contextlib import suppress
 from dataclasses import dataclass
 from enum import Enum
-import pandas as pd
+from functools import lru_cache
+import math
 from typing import Iterator
+import numpy as np
+
+from ivchecker import instrument
+from ivchecker.dataset import get_dataset
+from ivchecker.names import characteristic_index, did_you_mean, nature_index, species_index
+from ivchecker.shared import attached_tables
+from ivchecker.tables import get_basestat_table
+
+# the most EVs that can be put into one stat
+MAX_EV = 252
+
+# the most EVs a Pokémon can have in total
+MAX_TOTAL_EVS = 510
 
-from ivchecker.utils import ROOT, config, fuzzy, search_dataframe
 
 class Stat(Enum):
     HP = "HP"
@@ -28,8 +40,11 @@ class Nature:
     
     @classmethod
     def from_name(cls, name: str) -> Nature:
-        df = pd.read_csv(ROOT / config.paths.natures)
-        name, _, raised, lowered = search_dataframe(df, "Name", name)
+        try:
+            name, raised, lowered = get_dataset().get_nature(name)
+        except ValueError:
+            suggestions = did_you_mean(nature_index().suggest(name, limit=2))
+            raise ValueError(f"Could not find nature {name}.\n{suggestions}".rstrip()) from None
         raised = Stat[raised.upper()]
         lowered = Stat[lowered.upper()]
         
@@ -37,9 +52,7 @@ class Nature:
     
     @classmethod
     def read_all(cls) -> Iterator[Nature]:
-        df = pd.read_csv(ROOT / config.paths.natures)
-        
-        for _, (name, _, raised, lowered) in df.iterrows():
+        for name, raised, lowered in get_dataset().natures.values():
             raised = Stat[raised.upper()]
             lowered = Stat[lowered.upper()]
             
@@ -57,6 +70,17 @@ class Nature:
     def modifiers(self) -> tuple[float, float, float, float, float, float]:
         return tuple(self % stat for stat in Stat)
     
+    @classmethod
+    @lru_cache(maxsize=None)
+    def table(cls) -> tuple[tuple[Nature, ...], np.ndarray]:
+        """Return every nature, along with a (natures, 6) matrix of their modifiers."""
+        natures = tuple(cls.read_all())
+        shared = attached_tables()
+        if shared is not None:
+            return natures, shared.arrays["nature_modifiers"]
+
+        return natures, np.array([nature.modifiers for nature in natures])
+
     @property
     def is_neutral(self) -> bool:
         return (self.raised == self.lowered)
@@ -76,13 +100,16 @@ class Characteristic:
     
     @classmethod
     def read_all(cls) -> Iterator[str]:
-        df = pd.read_csv(ROOT / config.paths.characteristics)
-        yield from df["Characteristic"]
+        for description, _, _ in get_dataset().characteristics.values():
+            yield description
         
     @classmethod
     def get(cls, characteristic: str) -> Characteristic:
-        df = pd.read_csv(ROOT / config.paths.characteristics)
-        _, high, residue = search_dataframe(df, "Characteristic", characteristic)
+        try:
+            _, high, residue = get_dataset().get_characteristic(characteristic)
+        except ValueError:
+            suggestions = did_you_mean(characteristic_index().suggest(characteristic, limit=2))
+            raise ValueError(f"Could not find characteristic {characteristic}.\n{suggestions}".rstrip()) from None
         
         return cls(characteristic, Stat[high.upper()], residue)
     
@@ -113,53 +140,41 @@ class HPType(Enum):
         
         n = sum((iv & 1) << i for i, iv in enumerate(ivs))
         return cls(n * 15 // 63)
-    
 
-def get_all_pokemon_names() -> list[str]:
-    df = pd.read_csv(ROOT / config.paths.basestats)
-    return df["Name"].tolist()
+    @classmethod
+    def from_name(cls, name: str) -> HPType:
+        try:
+            return cls[name.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown hidden power type: {name}") from None
 
 
-def _get_modern_basestats(pokemon: str) -> tuple[int, int, int, int, int, int]:
-    """Get the most recent basestats for the given Pokémon."""
-    df = pd.read_csv(ROOT / config.paths.basestats)
-    
-    try:
-        _, *stats = search_dataframe(df, "Name", pokemon)
-        return tuple(stats)
-    except ValueError:
-        opt1, opt2 = fuzzy(pokemon, options=get_all_pokemon_names(), limit=2)
-        raise ValueError(f"Could not find Pokémon {pokemon}.\nDid you mean {opt1} or {opt2}?")
+# Hidden power only depends on the parity of each IV, so there are just 64
+# patterns to consider. Bit i of a pattern is the parity of the i-th stat (in
+# Stat order), and the masks below have bit p set for each matching pattern p.
+ODD_PATTERNS = tuple(sum(1 << p for p in range(64) if p >> i & 1) for i in range(6))
+_PATTERN_TYPES = [HPType.get(*(p >> i & 1 for i in range(6))) for p in range(64)]
+HP_PATTERNS = {
+    hp_type: sum(1 << p for p, pattern_type in enumerate(_PATTERN_TYPES) if pattern_type == hp_type)
+    for hp_type in HPType
+}
+
+
+def get_all_pokemon_names() -> list[str]:
+    return [str(name) for name in get_dataset().species_names]
 
 
-def _get_stat_changes(pokemon: str) -> dict[int, tuple[int, int, int, int, int, int]]:
-    """Get all known stat changes for the given Pokémon, by generation."""
-    df = pd.read_csv(ROOT / config.paths.basestats)
-    filtered = df[df["Pokemon"].str.lower() == pokemon.lower()]
-    
-    return {gen: tuple(stats) for _, _, gen, *stats in filtered.values}
-    
 def get_basestats(pokemon: str, generation: int) -> tuple[int, int, int, int, int, int]:
     """Return the basestats for the given Pokémon in the given generation."""
-    modern_stats = _get_modern_basestats(pokemon)
-    
-    if generation == config.generations.most_recent:
-        # we're good to just return these stats
-        return modern_stats
-    
-    changes = _get_stat_changes(pokemon)
-    if not changes:
-        # This Pokémon doesn't have any stat changes, so
-        # we can just return the modern stats as well.
-        return modern_stats
-    
-    # Otherwise, there are changes that we need to undo.
-    for g in range(config.generations.most_recent, generation - 1, -1):
-        with suppress(KeyError):
-            return changes[g]
-        
-    # the stat changes were long enough ago that they don't affect us
-    return modern_stats
+    if instrument.active is not None:
+        instrument.active.count("basestat lookups")
+
+    try:
+        return get_basestat_table().get(pokemon, generation)
+    except KeyError:
+        instrument.count("unknown names")
+        suggestions = did_you_mean(species_index().suggest(pokemon, limit=2))
+        raise ValueError(f"Could not find Pokémon {pokemon}.\n{suggestions}".rstrip()) from None
 
 
 def calculate_stat(level: int, base: int, iv: int, ev: int, nature: float, stat: Stat) -> int:
@@ -171,4 +186,68 @@ def calculate_stat(level: int, base: int, iv: int, ev: int, nature: float, stat:
         return result + level + 10
     
     return int((result + 5) * nature)
-    
\ No newline at end of file
+    
+
+def validate_level(level: int) -> None:
+    """Raise a ValueError unless the level is one a Pokémon can have (1 to 100)."""
+    if not 1 <= level <= 100:
+        raise ValueError(f"Level must be from 1 to 100, not {level}.")
+
+
+def invert_raw(level: int, actual: int, nature: float, stat: Stat) -> tuple[int, int]:
+    """Return the inclusive bounds on 2 * base + iv + (ev // 4) for which calculate_stat gives the actual value.
+    As with the IVs in invert_stat, these are always an interval (empty if the bounds cross).
+    """
+    validate_level(level)
+
+    if stat == Stat.HP:
+        lo = hi = actual - level - 10
+    else:
+        # Solve int((t + 5) * nature) == actual for t. Dividing by the nature
+        # lands within a step of each bound, and then we nudge the bounds
+        # using the forward formula, so float rounding matches calculate_stat.
+        lo = math.ceil(actual / nature) - 5
+        while int((lo + 4) * nature) >= actual:
+            lo -= 1
+        while int((lo + 5) * nature) < actual:
+            lo += 1
+
+        hi = math.ceil((actual + 1) / nature) - 6
+        while int((hi + 6) * nature) <= actual:
+            hi += 1
+        while int((hi + 5) * nature) > actual:
+            hi -= 1
+
+    # invert t == raw * level // 100
+    return -(-100 * lo // level), (100 * hi + 99) // level
+
+
+def invert_stat(level: int, base: int, actual: int, ev: int, nature: float, stat: Stat) -> range:
+    """Return the IVs for which calculate_stat gives the actual value.
+    The stat never decreases as the IV increases, so these are always an interval.
+    """
+    lo, hi = invert_raw(level, actual, nature, stat)
+    offset = 2 * base + (ev // 4)
+
+    return range(max(lo - offset, 0), min(hi - offset, 31) + 1)
+
+
+def invert_stat_ev(level: int, base: int, actual: int, iv: int, nature: float, stat: Stat) -> range:
+    """Return the EVs (up to 252) for which calculate_stat gives the actual value."""
+    lo, hi = invert_raw(level, actual, nature, stat)
+    return _ev_range(lo, hi, 2 * base + iv)
+
+
+def invert_stat_evs(level: int, base: int, actual: int, nature: float, stat: Stat) -> dict[int, range]:
+    """Return the EVs (up to 252) for which calculate_stat gives the actual value,
+    for each IV for which there are any.
+    """
+    lo, hi = invert_raw(level, actual, nature, stat)
+    ranges = {iv: _ev_range(lo, hi, 2 * base + iv) for iv in range(32)}
+
+    return {iv: evs for iv, evs in ranges.items() if evs}
+
+
+def _ev_range(lo: int, hi: int, offset: int) -> range:
+    """Return the EVs that put offset + (ev // 4) within [lo, hi]."""
+    return range(max(4 * (lo - offset), 0), min(4 * (hi - offset) + 3, MAX_EV) + 1)
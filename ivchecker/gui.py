@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from itertools import count, takewhile
+from functools import lru_cache
+import math
 from pathlib import Path
-from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import Any, Generic, Protocol, TypeVar
-import yaml
+from typing import Any, Callable, Generic, Protocol, TypeVar
 
 _T = TypeVar("_T")
 
@@ -84,7 +84,8 @@ class Window(BaseWidget):
 
     def set_icon(self, ico, include_children: bool = False) -> None:
         if isinstance(ico, (Path, str)):
-            # load the image from file
+            # load the image from file (PIL is only needed here, so import it lazily)
+            from PIL import Image, ImageTk
             ico = ImageTk.PhotoImage(Image.open(ico))
 
         self._proxy.wm_iconphoto(include_children, ico)
@@ -150,6 +151,10 @@ class EditableWidget(Generic[_T], Protocol):
         """ Clear the contents of the widget. """
         ...
 
+    def on_change(self, callback: Callable[[], None]) -> None:
+        """ Call the callback whenever the contents change. """
+        ...
+
 
 class Label(PositionableWidget):
     wrapped_class = ttk.Label
@@ -173,7 +178,8 @@ class Textbox(PositionableWidget, ToggleWidget):
     wrapped_class = tk.Entry
     
     def __init__(self, master, *args, **kwargs) -> None:
-        super().__init__(master, *args, **kwargs)
+        self._var = tk.StringVar(master._proxy)
+        super().__init__(master, *args, textvariable=self._var, **kwargs)
 
     @property
     def value(self) -> str:
@@ -190,6 +196,10 @@ class Textbox(PositionableWidget, ToggleWidget):
         """ Clear the contents of the textbox. """
         self._proxy.delete(0, tk.END)
 
+    def on_change(self, callback: Callable[[], None]) -> None:
+        """ Call the callback whenever the contents change. """
+        self._var.trace_add("write", lambda *_: callback())
+
 
 class Dropdown(PositionableWidget):
     wrapped_class = ttk.Combobox
@@ -214,6 +224,10 @@ class Dropdown(PositionableWidget):
     def clear(self) -> None:
         self.value = ""
 
+    def on_change(self, callback: Callable[[], None]) -> None:
+        """ Call the callback whenever the selection changes. """
+        self._var.trace_add("write", lambda *_: callback())
+
 
 class Frame(PositionableWidget):
     wrapped_class = ttk.Frame
@@ -243,6 +257,19 @@ class TabbedDisplay(PositionableWidget):
         """ Add multiple tabs at once. """
         return [self.add_tab(label) for label in labels]
 
+    def build_lazily(self, builders: list[Callable[[Frame], None]]) -> None:
+        """ Fill in each tab (in order) with its builder, but only once it is first selected. """
+        pending = dict(zip(self.tabs, builders))
+
+        def build_selected(event=None) -> None:
+            tab = self.tabs[self._proxy.index("current")]
+            builder = pending.pop(tab, None)
+            if builder is not None:
+                builder(tab)
+
+        self._proxy.bind("<<NotebookTabChanged>>", build_selected)
+        build_selected()
+
 
 class Button(PositionableWidget, ToggleWidget):
     wrapped_class = ttk.Button
@@ -268,7 +295,7 @@ class Spinbox(PositionableWidget):
         self.min, self.max, self.step = min, max, step
         
         self._var = tk.StringVar()
-        values = tuple(takewhile(max.__ge__, count(min, step)))
+        values = _spin_values(min, max, step)
         
         super().__init__(master, from_=min, to=max, textvariable=self._var, values=values, wrap=wrap, *args, **kwargs)
 
@@ -288,4 +315,87 @@ class Spinbox(PositionableWidget):
         self._var.set(str(val))
         
     def clear(self) -> None:
-        self.value = self.min
\ No newline at end of file
+        self.value = self.min
+
+    def on_change(self, callback: Callable[[], None]) -> None:
+        """ Call the callback whenever the value changes. """
+        self._var.trace_add("write", lambda *_: callback())
+
+
+@lru_cache(maxsize=None)
+def _spin_values(min: float, max: float, step: float) -> tuple[float, ...]:
+    """ Return the values a Spinbox steps through, from min up to max. """
+    if all(isinstance(x, int) for x in (min, max, step)):
+        return tuple(range(min, max + 1, step))
+
+    return tuple(min + i * step for i in range(math.floor((max - min) / step) + 1))
+
+
+class Worker:
+    """ Runs calculations on a background thread, so the window stays responsive.
+
+    Tk may only be used from its own thread, so results aren't posted from the
+    worker thread; instead the Tk thread checks on the calculation with after().
+    Each request supersedes the one before: a request whose result arrives
+    after a newer request (or a cancel) is discarded.
+    """
+
+    def __init__(self, owner: BaseWidget, poll_ms: int = 15):
+        self.owner = owner
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ivchecker-worker")
+        self._pending: Future | None = None
+
+    def submit(self, job: Callable[[], _T], on_done: Callable[[_T], None], on_error: Callable[[ValueError], None] = error) -> None:
+        """ Run the job in the background, then pass its result to on_done on the Tk thread.
+        A ValueError from the job goes to on_error instead; any other exception is raised on the Tk thread.
+        """
+        self.cancel()
+        future = self._executor.submit(job)
+        self._pending = future
+        self._poll(future, self.generation, on_done, on_error)
+
+    def cancel(self) -> None:
+        """ Discard the current request. It can't be interrupted if it has started, but its result is ignored. """
+        self.generation += 1
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    def _poll(self, future: Future, generation: int, on_done: Callable, on_error: Callable) -> None:
+        if generation != self.generation:
+            return
+
+        if not future.done():
+            self.owner._proxy.after(self.poll_ms, self._poll, future, generation, on_done, on_error)
+            return
+
+        self._pending = None
+        try:
+            result = future.result()
+        except ValueError as e:
+            on_error(e)
+            return
+
+        on_done(result)
+
+
+class Debouncer:
+    """ Calls a function once its triggers pause for the given delay. """
+
+    def __init__(self, owner: BaseWidget, delay_ms: int, callback: Callable[[], None]):
+        self.owner = owner
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._after_id: str | None = None
+
+    def trigger(self) -> None:
+        """ Restart the countdown to the call. """
+        if self._after_id is not None:
+            self.owner._proxy.after_cancel(self._after_id)
+        self._after_id = self.owner._proxy.after(self.delay_ms, self._fire)
+
+    def _fire(self) -> None:
+        self._after_id = None
+        self.callback()
\ No newline at end of file
@@ -0,0 +1,153 @@
+from __future__ import annotations
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import time
+from typing import Iterator
+
+# The recorder in use, if any. Hot paths check this inline, so that a disabled
+# probe costs a single branch:
+#
+#     if instrument.active is not None:
+#         instrument.active.stage("stats", options)
+active: Recorder | None = None
+
+
+@dataclass
+class Event:
+    """One thing that happened while recording: a stage of a check finishing, or a counter going up."""
+    kind: str
+    name: str
+    check: int
+    # time since the last stage of the same check (or since it began)
+    seconds: float = 0.0
+    # the number of candidate IVs left for each stat after the stage
+    sizes: tuple[int, ...] = ()
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class Recorder:
+    """Collects per-stage timings, candidate set sizes and counters.
+
+    A check is opened with `begin`; each `stage` then records the time since the
+    previous one and how many IVs each stat has left. A check that raises never
+    reaches `finish`, so the summary counts it as failed, and its events stop
+    at the last stage it got through.
+    """
+
+    def __init__(self, keep_events: bool = True):
+        self.keep_events = keep_events
+        self.events: list[Event] = []
+        self.counters: Counter[str] = Counter()
+        self.stages: dict[str, _StageTotals] = {}
+
+        self.checks = 0
+        self.finished = 0
+        self._mark = time.perf_counter_ns()
+        self._cache_start = _cache_infos()
+
+    def begin(self, name: str) -> None:
+        self.checks += 1
+        self.counters[name] += 1
+        self._mark = time.perf_counter_ns()
+
+    def stage(self, name: str, options: dict | None = None) -> None:
+        now = time.perf_counter_ns()
+        seconds = (now - self._mark) / 1e9
+        self._mark = now
+
+        sizes = tuple(len(opts) for opts in options.values()) if options is not None else ()
+        self.stages.setdefault(name, _StageTotals()).add(seconds, sizes)
+        if self.keep_events:
+            self.events.append(Event("stage", name, self.checks, seconds, sizes))
+
+    def finish(self) -> None:
+        self.finished += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+        if self.keep_events:
+            self.events.append(Event("count", name, self.checks))
+
+    def summary(self) -> dict:
+        """Totals per stage and counter, plus the hits and misses of the process-wide caches while recording."""
+        cache_now = _cache_infos()
+        caches = {
+            name: {"hits": info.hits - self._cache_start[name].hits, "misses": info.misses - self._cache_start[name].misses}
+            for name, info in cache_now.items()
+        }
+
+        return {
+            "checks": self.checks,
+            "failed": self.checks - self.finished,
+            "stages": {name: totals.summary() for name, totals in self.stages.items()},
+            "counters": dict(self.counters),
+            "caches": caches,
+        }
+
+    def export_events(self) -> list[dict]:
+        return [event.as_dict() for event in self.events]
+
+
+class _StageTotals:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.emptied = 0
+        self.sizes: list[int] = []
+
+    def add(self, seconds: float, sizes: tuple[int, ...]) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if sizes:
+            self.emptied += not all(sizes)
+            self.sizes = [a + b for a, b in zip(self.sizes, sizes)] if self.sizes else list(sizes)
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.seconds * 1000, 3),
+            "mean_us": round(self.seconds / self.calls * 1e6, 3),
+            "max_us": round(self.max_seconds * 1e6, 3),
+            # how many checks had some stat with no IVs left after this stage
+            "emptied": self.emptied,
+            "mean_candidates": [round(total / self.calls, 2) for total in self.sizes],
+        }
+
+
+def count(name: str, n: int = 1) -> None:
+    """Bump a counter on the active recorder. For cold paths only; hot ones check `active` inline."""
+    if active is not None:
+        active.count(name, n)
+
+
+@contextmanager
+def recording(recorder: Recorder | None = None) -> Iterator[Recorder]:
+    """Record everything that happens inside the block."""
+    global active
+    previous, active = active, recorder or Recorder()
+    try:
+        yield active
+    finally:
+        active = previous
+
+
+def _cache_infos() -> dict:
+    """Return the lru_cache statistics of the process-wide data loaders."""
+    # These modules report to this one, so they're imported when needed rather
+    # than at the top.
+    from ivchecker import dataset, ivset, names, tables
+
+    loaders = {
+        "dataset": dataset.get_dataset,
+        "basestat_table": tables.get_basestat_table,
+        "species_index": names.species_index,
+        "nature_index": names.nature_index,
+        "characteristic_index": names.characteristic_index,
+        "residue_masks": ivset._residue_mask,
+    }
+    return {name: loader.cache_info() for name, loader in loaders.items()}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+# masks of every IV, and of the even and odd IVs
+ALL_IVS = 0xFFFF_FFFF
+EVEN_IVS = 0x5555_5555
+ODD_IVS = 0xAAAA_AAAA
+
+
+@lru_cache(maxsize=None)
+def _residue_mask(residue: int, modulus: int) -> int:
+    return sum(1 << iv for iv in range(residue % modulus, 32, modulus))
+
+
+class IVSet:
+    """An immutable set of IVs (0-31), stored as a 32-bit mask in which bit i
+    is set if IV i is in the set.
+    """
+    __slots__ = ("mask",)
+
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+
+    @classmethod
+    def all(cls) -> IVSet:
+        return cls(ALL_IVS)
+
+    @classmethod
+    def of(cls, ivs: Iterable[int]) -> IVSet:
+        mask = 0
+        for iv in ivs:
+            mask |= 1 << iv
+
+        return cls(mask)
+
+    @classmethod
+    def from_range(cls, ivs: range) -> IVSet:
+        """Convert a range of IVs with step 1."""
+        if not ivs:
+            return cls()
+
+        return cls(((1 << ivs.stop) - 1) ^ ((1 << ivs.start) - 1))
+
+    def __and__(self, other: IVSet) -> IVSet:
+        return IVSet(self.mask & other.mask)
+
+    def __or__(self, other: IVSet) -> IVSet:
+        return IVSet(self.mask | other.mask)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IVSet) and self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __contains__(self, iv: int) -> bool:
+        return 0 <= iv < 32 and (self.mask >> iv) & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the IVs in increasing order."""
+        mask = self.mask
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
+    def __repr__(self) -> str:
+        return f"IVSet({list(self)})"
+
+    @property
+    def min(self) -> int:
+        if not self.mask:
+            raise ValueError("empty IVSet has no minimum")
+
+        return (self.mask & -self.mask).bit_length() - 1
+
+    @property
+    def max(self) -> int:
+        if not self.mask:
+            raise ValueError("empty IVSet has no maximum")
+
+        return self.mask.bit_length() - 1
+
+    @property
+    def evens(self) -> IVSet:
+        return IVSet(self.mask & EVEN_IVS)
+
+    @property
+    def odds(self) -> IVSet:
+        return IVSet(self.mask & ODD_IVS)
+
+    @property
+    def all_even(self) -> bool:
+        return self.mask & ODD_IVS == 0
+
+    @property
+    def all_odd(self) -> bool:
+        return self.mask & EVEN_IVS == 0
+
+    def at_most(self, cap: int) -> IVSet:
+        """Return the IVs that are no greater than the cap."""
+        if cap < 0:
+            return IVSet()
+
+        return IVSet(self.mask & ((1 << (cap + 1)) - 1))
+
+    def congruent(self, residue: int, modulus: int) -> IVSet:
+        """Return the IVs that are congruent to the residue mod the modulus."""
+        return IVSet(self.mask & _residue_mask(residue, modulus))
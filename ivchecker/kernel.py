@@ -0,0 +1,105 @@
+from __future__ import annotations
+import numpy as np
+
+# every possible IV value
+IVS = np.arange(32)
+
+# True in the position of the HP stat, which uses a different formula
+IS_HP = np.array([True, False, False, False, False, False])
+
+# The weight of each stat's parity in the hidden power formula, which
+# orders the stats as HP, Atk, Def, Spe, SpA, SpD.
+HP_WEIGHTS = np.array([1, 2, 4, 16, 32, 8])
+
+# (64, 6): the parity of each stat in each of the 64 parity patterns, where
+# bit i of the pattern is the parity of the i-th stat
+PATTERN_BITS = (np.arange(64)[:, None] >> np.arange(6) & 1).astype(bool)
+
+# IVSet masks of the even and odd IVs
+EVEN_MASK = np.uint32(0x5555_5555)
+ODD_MASK = np.uint32(0xAAAA_AAAA)
+
+
+def calculate_stats(level, base, iv, ev, nature, is_hp) -> np.ndarray:
+    """Vectorized `engine.calculate_stat`. All arguments broadcast against each other."""
+    level, base, iv, ev = (np.asarray(x, dtype=np.int64) for x in (level, base, iv, ev))
+    result = (2 * base + iv + ev // 4) * level // 100
+
+    # float64 multiplication is the same IEEE operation as in Python, so the
+    # truncated values agree exactly with calculate_stat, edge cases included
+    return np.where(is_hp, result + level + 10, np.trunc((result + 5) * np.asarray(nature)).astype(np.int64))
+
+
+def stat_candidates(level, basestats, actual_stats, evs, modifiers) -> np.ndarray:
+    """Return a (..., 6, 32) boolean mask of the IVs that reproduce each observed stat.
+
+    `level` has shape (...), and the other arguments have shape (..., 6), with
+    the stats in `Stat` order.
+    """
+    level = np.asarray(level)[..., None, None]
+    base, actual, ev, nature = (np.asarray(x)[..., None] for x in (basestats, actual_stats, evs, modifiers))
+
+    return calculate_stats(level, base, IVS, ev, nature, IS_HP[:, None]) == actual
+
+
+def filter_characteristic(candidates: np.ndarray, high, residue) -> None:
+    """Apply characteristics to a (rows, 6, 32) candidate mask, in place.
+
+    `high` holds the index of each row's highest stat (-1 for no characteristic),
+    and `residue` that stat's value mod 5. Rows with no candidates for some stat
+    are left alone.
+    """
+    high, residue = np.asarray(high), np.asarray(residue)
+    rows = np.flatnonzero((high >= 0) & candidates.any(axis=-1).all(axis=-1))
+    high, residue = high[rows], residue[rows]
+
+    # The characteristic determines the residue mod 5
+    best = candidates[rows, high] & (IVS % 5 == residue[:, None])
+    candidates[rows, high] = best
+
+    # And we also know that no other IV can exceed this one.
+    cap = np.where(best.any(axis=-1), 31 - np.argmax(best[:, ::-1], axis=-1), -1)
+    candidates[rows] &= (IVS <= cap[:, None, None])
+
+
+def pack_candidates(candidates: np.ndarray) -> np.ndarray:
+    """Pack the IV axis of a (..., 32) boolean mask into uint32 IVSet masks."""
+    return np.packbits(candidates, axis=-1, bitorder="little").view("<u4")[..., 0]
+
+
+def unpack_candidates(masks: np.ndarray) -> np.ndarray:
+    """Unpack uint32 IVSet masks into a (..., 32) boolean mask, undoing `pack_candidates`."""
+    masks = np.asarray(masks, dtype="<u4")
+    return np.unpackbits(masks[..., None].view(np.uint8), axis=-1, bitorder="little").astype(bool)
+
+
+def hidden_power_types(ivs) -> np.ndarray:
+    """Vectorized `HPType.get`: map (..., 6) IV spreads to their HPType values."""
+    n = (np.asarray(ivs) & 1) @ HP_WEIGHTS
+    return n * 15 // 63
+
+
+# the hidden power type of each parity pattern
+PATTERN_TYPES = hidden_power_types(PATTERN_BITS.astype(int))
+
+
+def filter_hidden_power(masks: np.ndarray, hp_type) -> None:
+    """Apply hidden power types to a (rows, 6) array of IVSet masks, in place.
+
+    `hp_type` holds each row's HPType value (-1 for none). Rows with no
+    candidates for some stat are left alone.
+    """
+    hp_type = np.asarray(hp_type)
+    rows = np.flatnonzero((hp_type >= 0) & (masks != 0).all(axis=-1))
+    current = masks[rows]
+
+    # find the parity patterns that give the right type and that every stat can follow
+    has_even = (current & EVEN_MASK) != 0
+    has_odd = (current & ODD_MASK) != 0
+    followed = np.where(PATTERN_BITS, has_odd[:, None, :], has_even[:, None, :]).all(axis=-1)
+    patterns = followed & (PATTERN_TYPES == hp_type[rows, None])
+
+    # and keep the parities those patterns use
+    allow_odd = (patterns[:, :, None] & PATTERN_BITS).any(axis=1)
+    allow_even = (patterns[:, :, None] & ~PATTERN_BITS).any(axis=1)
+    masks[rows] = current & (np.where(allow_even, EVEN_MASK, 0) | np.where(allow_odd, ODD_MASK, 0)).astype(np.uint32)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from collections import Counter
+from functools import lru_cache
+import heapq
+from itertools import chain
+from typing import Iterable
+
+from ivchecker.dataset import get_dataset
+
+# the prefixes marking alternate forms in basestats.csv, and what they're short for
+FORM_PREFIXES = {
+    "m": ("mega",),
+    "gmax": ("gigantamax",),
+    "g": ("galar", "galarian"),
+    "a": ("alola", "alolan"),
+}
+
+# how many of the best n-gram matches are reranked by edit distance
+_RERANK = 12
+
+
+def normalize(name: str) -> str:
+    """Lowercase a name and spell its form prefix the way basestats.csv does,
+    e.g., "Mega Charizard X" -> "m-charizard-x".
+    """
+    name = "-".join(name.lower().replace("_", " ").replace("-", " ").split())
+
+    for short, spellings in FORM_PREFIXES.items():
+        for spelling in spellings:
+            if name.startswith(f"{spelling}-"):
+                return f"{short}-{name[len(spelling) + 1:]}"
+
+    return name
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distances(query: str, keys: Iterable[str]) -> list[int]:
+    """Return the Levenshtein distance from the query to each key.
+
+    This is Myers' bit-parallel algorithm, which tracks a whole column of the
+    usual dynamic programming table as bitmasks of its vertical deltas.
+    """
+    m = len(query)
+    if m == 0:
+        return [len(key) for key in keys]
+
+    # peq[c] has bit i set where query[i] == c
+    peq: dict[str, int] = {}
+    for i, c in enumerate(query):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    full, last = (1 << m) - 1, 1 << (m - 1)
+    distances = []
+    for key in keys:
+        pv, mv, score = full, 0, m
+        for c in key:
+            eq = peq.get(c, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & full)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            ph = ((ph << 1) | 1) & full
+            mh = (mh << 1) & full
+            pv = mh | (~(xv | ph) & full)
+            mv = ph & xv
+        distances.append(score)
+
+    return distances
+
+
+class NameIndex:
+    """A typo-tolerant index of names, for suggesting what the user might have meant.
+
+    Each name is indexed under its trigrams (and, for alternate forms, also
+    without its form prefix). A query counts shared trigrams through the
+    inverted index, then ranks the best few by edit distance.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: list[str] = []
+        self.keys: list[str] = []
+        self.key_owner: list[int] = []
+        self.gram_counts: list[int] = []
+        self.postings: dict[str, list[int]] = {}
+
+        for i, name in enumerate(names):
+            self.names.append(str(name))
+
+            key = normalize(name)
+            prefix, _, rest = key.partition("-")
+            keys = [key, rest] if prefix in FORM_PREFIXES and rest else [key]
+
+            for key in keys:
+                grams = _trigrams(key)
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(len(self.keys))
+                self.keys.append(key)
+                self.gram_counts.append(len(grams))
+                self.key_owner.append(i)
+
+    def suggest(self, query: str, limit: int) -> list[str]:
+        """Return up to `limit` names closest to the query, best first."""
+        query = normalize(query)
+        grams = _trigrams(query)
+
+        shared = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in grams))
+
+        # the Dice coefficient of the two sets of trigrams
+        def dice(k: int) -> float:
+            return 2 * shared[k] / (len(grams) + self.gram_counts[k])
+
+        best = heapq.nlargest(_RERANK, shared, key=dice)
+        distances = _edit_distances(query, [self.keys[k] for k in best])
+        best = [k for _, _, k in sorted(zip(distances, (-dice(k) for k in best), best))]
+
+        suggestions: list[str] = []
+        for k in best:
+            name = self.names[self.key_owner[k]]
+            if name not in suggestions:
+                suggestions.append(name)
+
+        return suggestions[:limit]
+
+
+def did_you_mean(suggestions: list[str]) -> str:
+    """Phrase a list of suggestions, e.g., "Did you mean A or B?"."""
+    if not suggestions:
+        return ""
+
+    if len(suggestions) == 1:
+        return f"Did you mean {suggestions[0]}?"
+
+    return f"Did you mean {', '.join(suggestions[:-1])} or {suggestions[-1]}?"
+
+
+@lru_cache(maxsize=None)
+def species_index() -> NameIndex:
+    return NameIndex(get_dataset().species_names)
+
+
+@lru_cache(maxsize=None)
+def nature_index() -> NameIndex:
+    return NameIndex(name for name, _, _ in get_dataset().natures.values())
+
+
+@lru_cache(maxsize=None)
+def characteristic_index() -> NameIndex:
+    return NameIndex(description for description, _, _ in get_dataset().characteristics.values())
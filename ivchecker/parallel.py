@@ -0,0 +1,99 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+from typing import Callable
+import numpy as np
+
+from ivchecker.dataset import get_dataset
+from ivchecker.names import species_index
+from ivchecker.runners import BATCH_COLUMNS, check_ivs_batch
+from ivchecker.shared import attach_tables, publish_tables
+from ivchecker.tables import get_basestat_table
+
+OPTIONAL_COLUMNS = ("characteristic", "hidden_power_type")
+
+
+def _init_worker(segment: str | None) -> None:
+    """Load the reference data once per worker, rather than once per shard."""
+    if segment is not None:
+        attach_tables(segment)
+
+        # a forked worker may have inherited the parent's copies
+        get_dataset.cache_clear()
+        get_basestat_table.cache_clear()
+
+    get_dataset()
+    get_basestat_table()
+    species_index()
+
+
+def shard_rows(observations, chunk_size: int) -> list[np.ndarray]:
+    """Split the row numbers into shards of at most chunk_size rows.
+
+    Rows are grouped by species and generation first, so that each shard only
+    has to resolve a handful of distinct base stats.
+    """
+    names = np.char.lower(np.asarray(observations["pokemon"], dtype=str))
+    _, name_idx = np.unique(names, return_inverse=True)
+    _, gen_idx = np.unique(np.asarray(observations["generation"]), return_inverse=True)
+
+    order = np.argsort(name_idx * (gen_idx.max(initial=0) + 1) + gen_idx, kind="stable")
+    return [order[start:start + chunk_size] for start in range(0, len(order), chunk_size)]
+
+
+def check_ivs_parallel(
+    observations,
+    workers: int | None = None,
+    chunk_size: int = 20000,
+    progress: Callable[[int, int], None] | None = None,
+    share_tables: bool = True
+) -> np.ndarray:
+    """ Get the possible IVs for many Pokémon at once, spread across processes.
+
+    Takes the same columns and returns the same (rows, 6) array of masks as
+    runners.check_ivs_batch, in the same row order. `workers` defaults to the
+    number of CPUs, and `progress` (if given) is called as progress(done, total)
+    in rows each time a shard finishes. Unless share_tables is False, the
+    workers read the reference tables from one shared memory segment rather
+    than each loading a copy.
+    """
+    columns = {column: np.asarray(observations[column]) for column in BATCH_COLUMNS}
+    for column in OPTIONAL_COLUMNS:
+        try:
+            columns[column] = np.array([v if isinstance(v, str) else "" for v in observations[column]])
+        except KeyError:
+            pass
+
+    n = len(columns["pokemon"])
+    masks = np.empty((n, 6), dtype=np.uint32)
+    if n == 0:
+        return masks
+
+    shards = shard_rows(columns, chunk_size)
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+
+    shared = publish_tables() if share_tables else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared and shared.name,)) as pool:
+            pending = {
+                pool.submit(check_ivs_batch, {column: values[rows] for column, values in columns.items()}): rows
+                for rows in shards
+            }
+
+            done_rows = 0
+            for future in as_completed(pending):
+                rows = pending[future]
+                try:
+                    masks[rows] = future.result()
+                except BaseException:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+
+                done_rows += len(rows)
+                if progress is not None:
+                    progress(done_rows, n)
+    finally:
+        if shared is not None:
+            shared.unlink()
+
+    return masks
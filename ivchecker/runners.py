@@ -1,10 +1,62 @@
+from dataclasses import dataclass
 from functools import partial
-import itertools
+from typing import Iterable
+import numpy as np
 
-from ivchecker.engine import Characteristic, HPType, Nature, Stat, calculate_stat, get_basestats
+from ivchecker import instrument
+from ivchecker.constraints import Constraint, KnownCharacteristic, KnownHiddenPower, ObservedStats, propagate
+from ivchecker.engine import (
+    MAX_TOTAL_EVS,
+    Characteristic,
+    HPType,
+    Nature,
+    Stat,
+    calculate_stat,
+    get_basestats,
+    invert_stat,
+    invert_stat_evs,
+    validate_level,
+)
+from ivchecker.ivset import IVSet
+from ivchecker.kernel import filter_characteristic, filter_hidden_power, pack_candidates, stat_candidates, unpack_candidates
 from ivchecker.utils import SixInts
 
 
+def _filter_stats_python(level: int, basestats: SixInts, actual_stats: SixInts, evs: SixInts, nature: Nature) -> dict[Stat, IVSet]:
+    """ Find the IVs matching each stat by evaluating every IV in turn. """
+    return {
+        stat: IVSet.of(iv for iv in range(32) if actual == calculate_stat(level, base, iv, ev, nature % stat, stat))
+        for base, actual, ev, stat in zip(basestats, actual_stats, evs, Stat)
+    }
+
+
+def _filter_stats_numpy(level: int, basestats: SixInts, actual_stats: SixInts, evs: SixInts, nature: Nature) -> dict[Stat, IVSet]:
+    """ Find the IVs matching each stat by evaluating all of them as one array. """
+    masks = pack_candidates(stat_candidates(level, basestats, actual_stats, evs, nature.modifiers))
+    return {stat: IVSet(mask) for stat, mask in zip(Stat, masks.tolist())}
+
+
+def _filter_stats_analytic(level: int, basestats: SixInts, actual_stats: SixInts, evs: SixInts, nature: Nature) -> dict[Stat, IVSet]:
+    """ Find the IVs matching each stat by inverting the stat formula. """
+    return {
+        stat: IVSet.from_range(invert_stat(level, base, actual, ev, nature % stat, stat))
+        for base, actual, ev, stat in zip(basestats, actual_stats, evs, Stat)
+    }
+
+
+STAT_FILTERS = {
+    "python": _filter_stats_python,
+    "numpy": _filter_stats_numpy,
+    "analytic": _filter_stats_analytic,
+}
+
+BATCH_COLUMNS = (
+    "pokemon", "generation", "level", "nature",
+    *(f"stat_{stat.value}" for stat in Stat),
+    *(f"ev_{stat.value}" for stat in Stat),
+)
+
+
 def check_ivs(
     pokemon: str,
     generation: int,
@@ -13,58 +65,260 @@ def check_ivs(
     nature_name: str,
     evs: SixInts,
     characteristic: Characteristic | None,
-    hidden_power_type: str
-) -> tuple[list[int]]:
-    """ Get the possible IVs for a Pokémon. """
-    options: dict[Stat, list[int]] = {}
+    hidden_power_type: str,
+    backend: str = "analytic",
+    constraints: Iterable[Constraint] = ()
+) -> tuple[IVSet, ...]:
+    """ Get the possible IVs for a Pokémon. The backend names one of the STAT_FILTERS.
+
+    Any further evidence (e.g., IV judge ranges) can be given as constraints,
+    which are propagated together with the stats, characteristic and hidden
+    power type (see ivchecker.constraints).
+    """
+    try:
+        filter_stats = STAT_FILTERS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown backend: {backend!r}") from None
+    validate_level(level)
+
+    # Each probe costs one branch unless instrumentation is on (see ivchecker.instrument).
+    recorder = instrument.active
+    if recorder is not None:
+        recorder.begin("check_ivs")
 
     # 1: Get the Pokémon's base stats
     basestats = get_basestats(pokemon=pokemon, generation=generation)
+    if recorder is not None:
+        recorder.stage("basestats")
 
-    # 2: Filter by actual stats
-    nature = Nature.from_name(nature_name)
-    for base, actual, ev, stat in zip(basestats, actual_stats, evs, Stat):
-        options[stat] = [iv for iv in range(32) if actual == calculate_stat(level, base, iv, ev, nature % stat, stat)]
+    # 2: Gather the evidence
+    evidence = [
+        ObservedStats(filter_stats, level, basestats, actual_stats, evs, Nature.from_name(nature_name)),
+        *_filter_evidence(characteristic, hidden_power_type),
+        *constraints,
+    ]
 
-    # 3: Filter by characteristic
-    if all(options.values()) and characteristic:
-        # The characteristic determines the residue mod 5
-        options[characteristic.high_stat] = [
-            iv for iv in options[characteristic.high_stat]
-            if iv % 5 == characteristic.residue
-        ]
-
-        # And we also know that no other IV can exceed this one.
-        if not options:
-            raise ValueError(f"No possible IVs found. Check entered stats for errors.")
-        cap = max(options[characteristic.high_stat])
-        for stat, opts in options.items():
-            options[stat] = [iv for iv in opts if iv <= cap]
-
-    # 4: Filter by hidden power type.
-    # To speed up calculation, observe that HP calculations only require
-    # the least significant bit, so we'll do our initial filtering in ℤ/2.
-    if all(options.values()) and hidden_power_type:
-        lsb = {stat: set(x & 1 for x in opts)
-               for stat, opts in options.items()}
-        bit_options: dict[Stat, set[int]] = {stat: set() for stat in Stat}
-
-        for ivs in itertools.product(*lsb.values()):
-            if HPType.get(*ivs).name.lower() == hidden_power_type.lower():
-                # we have a match, so add these IVs to the set
-                for stat, iv in zip(Stat, ivs):
-                    bit_options[stat].add(iv)
-
-        # With the bit matches resolved, we just need to filter the
-        # actual IV possibilities.
-        for stat, opts in options.items():
-            options[stat] = [iv for iv in opts if iv & 1 in bit_options[stat]]
+    # 3: Filter by all of it
+    options = propagate(evidence)
 
     # Filtering done, so we just return the results.
+    if recorder is not None:
+        recorder.finish()
     return tuple(options[stat] for stat in Stat)
 
 
+def check_ivs_all_natures(
+    pokemon: str,
+    generation: int,
+    level: int,
+    actual_stats: SixInts,
+    evs: SixInts,
+    characteristic: Characteristic | None = None,
+    hidden_power_type: str = ""
+) -> dict[str, tuple[IVSet, ...]]:
+    """ Get the possible IVs for a Pokémon under each nature it could have.
+
+    Every nature is checked at once, as one row of a (natures, 6) modifier
+    matrix. Returns the natures consistent with the stats (in the order of the
+    data file), mapped to the IVs possible with that nature.
+    """
+    validate_level(level)
+
+    # 1: Get the Pokémon's base stats
+    basestats = get_basestats(pokemon=pokemon, generation=generation)
+
+    # 2: Filter by actual stats, under every nature
+    natures, modifiers = Nature.table()
+    candidates = stat_candidates(level, basestats, actual_stats, evs, modifiers)
+
+    # 3: Filter by characteristic
+    high = np.full(len(natures), list(Stat).index(characteristic.high_stat) if characteristic else -1)
+    residue = np.full(len(natures), characteristic.residue if characteristic else 0)
+    filter_characteristic(candidates, high, residue)
+
+    # 4: Filter by hidden power type
+    masks = pack_candidates(candidates)
+    hp_type = np.full(len(natures), HPType.from_name(hidden_power_type).value if hidden_power_type else -1)
+    filter_hidden_power(masks, hp_type)
+    _refilter(masks, high, residue, hp_type)
+
+    return {
+        nature.name: tuple(IVSet(mask) for mask in row)
+        for nature, row in zip(natures, masks.tolist()) if all(row)
+    }
+
+
+def check_ivs_unknown_evs(
+    pokemon: str,
+    generation: int,
+    level: int,
+    actual_stats: SixInts,
+    nature_name: str,
+    characteristic: Characteristic | None = None,
+    hidden_power_type: str = "",
+    ev_cap: int | None = MAX_TOTAL_EVS
+) -> tuple[dict[int, range], ...]:
+    """ Get the possible IVs for a Pokémon whose EVs aren't known.
+
+    For each stat, maps every possible IV to the range of EVs that give the
+    actual stat with it. With an ev_cap, an IV is only possible if its EVs fit
+    under the cap alongside the fewest EVs every other stat could have.
+    """
+    # Each probe costs one branch unless instrumentation is on (see ivchecker.instrument).
+    recorder = instrument.active
+    if recorder is not None:
+        recorder.begin("check_ivs_unknown_evs")
+
+    # 1: Get the Pokémon's base stats
+    basestats = get_basestats(pokemon=pokemon, generation=generation)
+    if recorder is not None:
+        recorder.stage("basestats")
+
+    # 2: Solve each stat for the EVs, IV by IV
+    nature = Nature.from_name(nature_name)
+    evs = {
+        stat: invert_stat_evs(level, base, actual, nature % stat, stat)
+        for base, actual, stat in zip(basestats, actual_stats, Stat)
+    }
+    if recorder is not None:
+        recorder.stage("stats", evs)
+
+    # 3: Filter by characteristic, hidden power type and EV cap until nothing changes,
+    # since ruling IVs out for one can rule out more for another.
+    evidence = _filter_evidence(characteristic, hidden_power_type)
+    while True:
+        options = propagate(evidence, {stat: IVSet.of(by_iv) for stat, by_iv in evs.items()})
+
+        filtered = {stat: {iv: by_iv[iv] for iv in options[stat]} for stat, by_iv in evs.items()}
+        if ev_cap is not None and all(filtered.values()):
+            filtered = _cap_total_evs(filtered, ev_cap)
+
+        if filtered == evs:
+            break
+        evs = filtered
+
+    if recorder is not None:
+        recorder.finish()
+    return tuple(evs[stat] for stat in Stat)
+
+
+def _filter_evidence(characteristic: Characteristic | None, hidden_power_type: str) -> list[Constraint]:
+    """ The constraints for a characteristic and hidden power type, if given. """
+    evidence: list[Constraint] = []
+    if characteristic:
+        evidence.append(KnownCharacteristic(characteristic))
+    if hidden_power_type:
+        evidence.append(KnownHiddenPower.from_name(hidden_power_type))
+    return evidence
+
+
+def _cap_total_evs(evs: dict[Stat, dict[int, range]], cap: int) -> dict[Stat, dict[int, range]]:
+    """ Keep only the EVs that fit under the cap, given the fewest EVs each other stat needs. """
+    needs = {stat: min(ev_range.start for ev_range in by_iv.values()) for stat, by_iv in evs.items()}
+    total = sum(needs.values())
+
+    capped = {}
+    for stat, by_iv in evs.items():
+        allowance = cap - (total - needs[stat])
+        capped[stat] = {
+            iv: range(ev_range.start, min(ev_range.stop, allowance + 1))
+            for iv, ev_range in by_iv.items() if ev_range.start <= allowance
+        }
+
+    return capped
+
+
+def check_ivs_batch(observations, chunk_size: int = 65536) -> np.ndarray:
+    """ Get the possible IVs for many Pokémon at once.
+
+    `observations` maps each of the BATCH_COLUMNS to a column of equal length
+    (so a DataFrame works as well as a dict of arrays). The "characteristic"
+    and "hidden_power_type" columns are optional, and blank or missing entries
+    in them are ignored.
+
+    Returns a (rows, 6) array of IVSet masks, in which [i, s] holds the
+    possible IVs for stat s of row i. A level outside 1 to 100 in any row is
+    a ValueError, as in check_ivs.
+    """
+    n = len(observations["pokemon"])
+    if n == 0:
+        return np.zeros((0, 6), dtype="<u4")
+
+    level = np.asarray(observations["level"])
+    outside = (level < 1) | (level > 100)
+    if outside.any():
+        validate_level(int(level[outside][0]))
+
+    actual_stats = np.column_stack([np.asarray(observations[f"stat_{stat.value}"]) for stat in Stat])
+    evs = np.column_stack([np.asarray(observations[f"ev_{stat.value}"]) for stat in Stat])
+
+    # 1: Get the base stats once per distinct Pokémon and generation
+    names, name_idx = np.unique(np.asarray(observations["pokemon"], dtype=str), return_inverse=True)
+    generations, gen_idx = np.unique(np.asarray(observations["generation"]), return_inverse=True)
+    pairs, pair_idx = np.unique(name_idx * len(generations) + gen_idx, return_inverse=True)
+    basestats = np.array([
+        get_basestats(pokemon=names[pair // len(generations)], generation=int(generations[pair % len(generations)]))
+        for pair in pairs
+    ]).reshape(-1, 6)[pair_idx]
+
+    # 2: Filter by actual stats, resolving each distinct nature once
+    natures, nature_idx = np.unique(np.asarray(observations["nature"], dtype=str), return_inverse=True)
+    modifiers = np.array([Nature.from_name(name).modifiers for name in natures]).reshape(-1, 6)[nature_idx]
+
+    candidates = np.empty((n, 6, 32), dtype=bool)
+    for start in range(0, n, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        candidates[chunk] = stat_candidates(level[chunk], basestats[chunk], actual_stats[chunk], evs[chunk], modifiers[chunk])
+
+    # 3: Filter by characteristic
+    descriptions, char_idx = _optional_column(observations, "characteristic", n)
+    chars = [Characteristic.get(description) if description else None for description in descriptions]
+    high = np.array([list(Stat).index(char.high_stat) if char else -1 for char in chars])[char_idx]
+    residue = np.array([char.residue if char else 0 for char in chars])[char_idx]
+    filter_characteristic(candidates, high, residue)
+
+    # 4: Filter by hidden power type
+    masks = pack_candidates(candidates)
+    hp_types, hp_idx = _optional_column(observations, "hidden_power_type", n)
+    hp_values = np.array([HPType.from_name(name).value if name else -1 for name in hp_types])[hp_idx]
+    filter_hidden_power(masks, hp_values)
+
+    _refilter(masks, high, residue, hp_values)
+
+    return masks
+
+
+def _refilter(masks: np.ndarray, high: np.ndarray, residue: np.ndarray, hp_type: np.ndarray) -> None:
+    """ Filter the rows with both a characteristic and a hidden power type again, in place,
+    until nothing changes, as check_ivs does. Each filter can rule out more
+    once the other has run.
+    """
+    rows = np.flatnonzero((high >= 0) & (hp_type >= 0))
+    while rows.size:
+        before = masks[rows]
+        candidates = unpack_candidates(before)
+        filter_characteristic(candidates, high[rows], residue[rows])
+        after = pack_candidates(candidates)
+        filter_hidden_power(after, hp_type[rows])
+
+        masks[rows] = after
+        rows = rows[(after != before).any(axis=-1)]
+
+
+def _optional_column(observations, column: str, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """ Return the distinct values of a text column and the index of each row's value.
+    Missing columns and non-text entries (None, NaN) count as blank.
+    """
+    try:
+        values = observations[column]
+    except KeyError:
+        return np.array([""]), np.zeros(n, dtype=int)
+
+    return np.unique(np.array([v if isinstance(v, str) else "" for v in values], dtype=str), return_inverse=True)
+
+
 def get_ranges(pokemon: str, generation: int, level: int) -> tuple[tuple[int, int, int]]:
+    validate_level(level)
     basestats = get_basestats(pokemon=pokemon, generation=generation)
 
     output: dict[Stat, tuple[int, int, int]] = {}
@@ -80,3 +334,86 @@ def get_ranges(pokemon: str, generation: int, level: int) -> tuple[tuple[int, in
         output[stat] = (minimum, maximum_0, maximum_252)
 
     return tuple(output[stat] for stat in Stat)
+
+
+@dataclass
+class Observation:
+    level: int
+    actual_stats: SixInts
+    evs: SixInts
+
+
+class IVSolver:
+    """ Narrow down one Pokémon's IVs from a series of observations of its stats,
+    e.g., at several levels as it trains. Each observation costs one inversion
+    of the stat formula and one intersection per stat, and once every IV is
+    known, just one evaluation of the formula per stat.
+    """
+
+    def __init__(
+        self,
+        pokemon: str,
+        generation: int,
+        nature_name: str,
+        characteristic: Characteristic | None = None,
+        hidden_power_type: str = "",
+        observations: Iterable[Observation] = ()
+    ):
+        self.basestats = get_basestats(pokemon=pokemon, generation=generation)
+        self.nature = Nature.from_name(nature_name)
+        self.characteristic = characteristic
+        self.hidden_power_type = hidden_power_type
+
+        self.observations: list[Observation] = []
+        self.candidates: dict[Stat, IVSet] = {stat: IVSet.all() for stat in Stat}
+
+        for observation in observations:
+            self.add(observation)
+
+    @property
+    def is_consistent(self) -> bool:
+        """ Return False once some stat has no possible IVs left. """
+        return all(self.candidates.values())
+
+    @property
+    def is_resolved(self) -> bool:
+        """ Return True once every stat is down to a single IV. """
+        return all(len(opts) == 1 for opts in self.candidates.values())
+
+    def add(self, observation: Observation) -> bool:
+        """ Narrow the candidates using a new observation. Return whether they are still consistent. """
+        validate_level(observation.level)
+        self.observations.append(observation)
+
+        # once a stat is out of options, no further observation can change that
+        if not self.is_consistent:
+            return False
+
+        # once every IV is known, an observation can only confirm them or rule them out
+        if self.is_resolved:
+            for base, actual, ev, stat in zip(self.basestats, observation.actual_stats, observation.evs, Stat):
+                if calculate_stat(observation.level, base, self.candidates[stat].min, ev, self.nature % stat, stat) != actual:
+                    self.candidates[stat] = IVSet()
+                    return False
+            return True
+
+        for base, actual, ev, stat in zip(self.basestats, observation.actual_stats, observation.evs, Stat):
+            matches = invert_stat(observation.level, base, actual, ev, self.nature % stat, stat)
+            self.candidates[stat] &= IVSet.from_range(matches)
+
+            if not self.candidates[stat]:
+                return False
+
+        return True
+
+    def ivs(self) -> tuple[IVSet, ...]:
+        """ Get the possible IVs given every observation so far, as check_ivs would. """
+        recorder = instrument.active
+        if recorder is not None:
+            recorder.begin("IVSolver.ivs")
+
+        options = propagate(_filter_evidence(self.characteristic, self.hidden_power_type), self.candidates)
+
+        if recorder is not None:
+            recorder.finish()
+        return tuple(options[stat] for stat in Stat)
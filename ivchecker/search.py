@@ -0,0 +1,98 @@
+from __future__ import annotations
+from functools import lru_cache
+import math
+import numpy as np
+
+from ivchecker.engine import Nature, Stat, get_all_pokemon_names, invert_raw
+from ivchecker.kernel import stat_candidates
+from ivchecker.tables import get_basestat_table
+from ivchecker.utils import SixInts, config
+
+# the modifiers a nature can apply to a stat other than HP
+_MODIFIERS = (0.9, 1.0, 1.1)
+
+
+class BaseStatIndex:
+    """Every species' base stats in one generation, sorted separately by each
+    stat, so that the species with a stat in some interval can be found by
+    binary search.
+    """
+
+    def __init__(self, stats: np.ndarray):
+        self.stats = stats
+        self.order = np.argsort(stats, axis=0, kind="stable")
+        self.sorted = np.take_along_axis(stats, self.order, axis=0)
+
+    def rows_between(self, stat: int, lo: int, hi: int) -> np.ndarray:
+        """Return the rows of the species whose base stat is in [lo, hi]."""
+        column = self.sorted[:, stat]
+        start, stop = np.searchsorted(column, lo, side="left"), np.searchsorted(column, hi, side="right")
+        return self.order[start:stop, stat]
+
+
+@lru_cache(maxsize=None)
+def get_basestat_index(generation: int) -> BaseStatIndex:
+    """Return the index of the given generation's base stats, building it on first use."""
+    table = get_basestat_table()
+    return BaseStatIndex(table.stats[:, table.column(generation)])
+
+
+def base_interval(level: int, actual: int, ev: int, modifiers: tuple[float, ...], stat: Stat) -> tuple[int, int]:
+    """Return the inclusive bounds on the base stat for which some IV (and one
+    of the modifiers) gives the actual stat. The bounds cross (lo > hi) when
+    there is no such base stat.
+    """
+    lo, hi = math.inf, -math.inf
+    for nature in modifiers:
+        raw_lo, raw_hi = invert_raw(level, actual, nature, stat)
+        if raw_lo > raw_hi:
+            continue
+
+        # solve raw_lo <= 2 * base + iv + ev // 4 <= raw_hi for some iv in [0, 31]
+        lo = min(lo, -(-(raw_lo - ev // 4 - 31) // 2))
+        hi = max(hi, (raw_hi - ev // 4) // 2)
+
+    return (lo, hi) if lo <= hi else (1, 0)
+
+
+def find_species(
+    level: int,
+    actual_stats: SixInts,
+    evs: SixInts = (0, 0, 0, 0, 0, 0),
+    nature_name: str | None = None,
+    generation: int = config.generations.most_recent
+) -> list[str]:
+    """ Get every Pokémon (or form) for which some IV spread gives the actual stats.
+
+    Without a nature, any nature is allowed. The base stats are narrowed to an
+    interval per stat, the species in those intervals are looked up in the
+    generation's BaseStatIndex, and only those are checked exactly.
+    """
+    index = get_basestat_index(generation)
+
+    if nature_name:
+        nature = Nature.from_name(nature_name)
+        options = [(nature % stat,) for stat in Stat]
+        modifiers = np.array([nature.modifiers])
+    else:
+        options = [(1.0,) if stat == Stat.HP else _MODIFIERS for stat in Stat]
+        _, modifiers = Nature.table()
+
+    # 1: Bound each base stat, and look up the stat with the fewest matches
+    bounds = np.array([
+        base_interval(level, actual, ev, mods, stat)
+        for actual, ev, mods, stat in zip(actual_stats, evs, options, Stat)
+    ])
+    rows = min((index.rows_between(s, lo, hi) for s, (lo, hi) in enumerate(bounds)), key=len)
+
+    # 2: Keep the species within every bound
+    stats = index.stats[rows]
+    rows = rows[((stats >= bounds[:, 0]) & (stats <= bounds[:, 1])).all(axis=1)]
+
+    # 3: Check the rest exactly: some nature must leave every stat an IV
+    candidates = stat_candidates(level, index.stats[rows][:, None], actual_stats, evs, modifiers)
+    rows = rows[candidates.any(axis=-1).all(axis=-1).any(axis=-1)]
+
+    # the table's rows are in the same order as the data file
+    names = get_all_pokemon_names()
+    return [names[row] for row in np.sort(rows)]
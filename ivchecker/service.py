@@ -0,0 +1,301 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import json
+import time
+
+from ivchecker.cli import basestats_result, ivs_result, ranges_result
+from ivchecker.dataset import get_dataset
+from ivchecker.engine import Characteristic, Stat, get_basestats
+from ivchecker.ivset import IVSet
+from ivchecker.names import species_index
+from ivchecker.runners import check_ivs, check_ivs_batch, get_ranges
+from ivchecker.tables import get_basestat_table
+from ivchecker.utils import config
+
+# The service is for local tools only, so it never listens beyond this machine.
+HOST = "127.0.0.1"
+
+# how many recent requests the latency and throughput figures are based on
+_WINDOW = 4096
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    422: "Unprocessable Entity", 500: "Internal Server Error",
+}
+
+
+@dataclass
+class EndpointStats:
+    count: int = 0
+    errors: int = 0
+    recent: deque = field(default_factory=lambda: deque(maxlen=_WINDOW))
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.count += 1
+        self.errors += not ok
+        self.recent.append((time.monotonic(), seconds))
+
+    def summary(self) -> dict:
+        latencies = sorted(seconds * 1000 for _, seconds in self.recent)
+
+        def percentile(p: float) -> float | None:
+            return round(latencies[min(int(p * len(latencies)), len(latencies) - 1)], 3) if latencies else None
+
+        # throughput over the last ten seconds
+        cutoff = time.monotonic() - 10
+        recent = sum(1 for timestamp, _ in self.recent if timestamp >= cutoff)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "latency_ms": {"p50": percentile(0.5), "p90": percentile(0.9), "p99": percentile(0.99)},
+            "requests_per_second": recent / 10,
+        }
+
+
+class CheckBatcher:
+    """Coalesce concurrent check_ivs requests into one check_ivs_batch call.
+
+    The first request to arrive opens a batch, which then collects whatever
+    else arrives within the window (up to the maximum size).
+    """
+
+    def __init__(self, window: float, max_size: int):
+        self.window = window
+        self.max_size = max_size
+        self.queue: asyncio.Queue[tuple[dict, asyncio.Future]] = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+
+    async def check(self, request: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((request, future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batches += 1
+            self.rows += len(batch)
+
+            requests = [request for request, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, _check_many, requests)
+            except Exception as e:
+                # A bug shouldn't take the batcher down with it, or every later request would hang.
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def _check_one(request: dict) -> dict:
+    char = request.get("characteristic")
+    try:
+        ivs = check_ivs(
+            pokemon=request["pokemon"],
+            generation=request["generation"],
+            level=request["level"],
+            actual_stats=tuple(request["stats"]),
+            nature_name=request["nature"],
+            evs=tuple(request.get("evs", [0] * 6)),
+            characteristic=Characteristic.get(char) if char else None,
+            hidden_power_type=request.get("hidden_power_type") or ""
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": _describe(e)}
+
+    return ivs_result(ivs)
+
+
+def _check_many(requests: list[dict]) -> list[dict]:
+    """Check a batch of requests together, falling back to one at a time if any of them is invalid."""
+    try:
+        observations = {
+            "pokemon": [r["pokemon"] for r in requests],
+            "generation": [r["generation"] for r in requests],
+            "level": [r["level"] for r in requests],
+            "nature": [r["nature"] for r in requests],
+            "characteristic": [r.get("characteristic") for r in requests],
+            "hidden_power_type": [r.get("hidden_power_type") for r in requests],
+        }
+        for s, stat in enumerate(Stat):
+            observations[f"stat_{stat.value}"] = [r["stats"][s] for r in requests]
+            observations[f"ev_{stat.value}"] = [r.get("evs", [0] * 6)[s] for r in requests]
+
+        masks = check_ivs_batch(observations)
+    except (KeyError, TypeError, ValueError, IndexError):
+        return [_check_one(request) for request in requests]
+
+    # Rows with a stat left without IVs go through check_ivs itself, which
+    # tells apart the inconsistent inputs it reports as errors.
+    return [
+        ivs_result([IVSet(mask) for mask in row]) if all(row) else _check_one(request)
+        for request, row in zip(requests, masks.tolist())
+    ]
+
+
+def _describe(e: Exception) -> str:
+    return f"missing field: {e.args[0]}" if isinstance(e, KeyError) else str(e)
+
+
+def _check_level(request: dict) -> None:
+    level = request.get("level")
+    if level is not None and (not isinstance(level, int) or isinstance(level, bool) or not 1 <= level <= 100):
+        raise ValueError(f"Level must be a whole number from 1 to 100, not {level!r}.")
+
+
+class Service:
+    """A local HTTP/JSON service that keeps the engine warm between requests.
+
+    POST /check_ivs, /get_ranges and /get_basestats take a JSON object with the
+    same fields as the matching function, and GET /health reports the request
+    counts, latencies and throughput of each endpoint.
+    """
+
+    def __init__(self, batch_window: float = 0.002, max_batch: int = 512):
+        self.batcher = CheckBatcher(batch_window, max_batch)
+        self.stats = {name: EndpointStats() for name in ("/check_ivs", "/get_ranges", "/get_basestats", "/health")}
+        self.started = time.monotonic()
+
+    @staticmethod
+    def warm_up() -> None:
+        """Load everything a request might need, so the first one isn't slow."""
+        get_dataset()
+        get_basestat_table()
+        species_index()
+
+    async def serve(self, port: int) -> None:
+        self.warm_up()
+        batcher = asyncio.create_task(self.batcher.run())
+
+        server = await asyncio.start_server(self.handle, HOST, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    body = await reader.readexactly(int(headers.get("content-length", 0)))
+                except ValueError:
+                    status, payload, version = 400, {"error": "malformed request"}, "HTTP/1.0"
+                else:
+                    status, payload = await self.dispatch(method, path, body)
+
+                data = json.dumps(payload, ensure_ascii=False).encode()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if path not in self.stats:
+            return 404, {"error": f"no such endpoint: {path}"}
+
+        start = time.perf_counter()
+        status, payload = await self._dispatch(method, path, body)
+        self.stats[path].record(time.perf_counter() - start, ok=(status == 200 and "error" not in payload))
+
+        return status, payload
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if path == "/health":
+            return (200, self.health()) if method == "GET" else (405, {"error": "use GET"})
+
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+
+        request.setdefault("generation", config.generations.most_recent)
+        try:
+            _check_level(request)
+        except ValueError as e:
+            return 422, {"error": str(e)}
+
+        if path == "/check_ivs":
+            try:
+                result = await self.batcher.check(request)
+            except Exception as e:
+                return 500, {"error": f"internal error: {e!r}"}
+            return (422 if "error" in result else 200), result
+
+        generation = request["generation"]
+        try:
+            basestats = get_basestats(pokemon=request["pokemon"], generation=generation)
+            if path == "/get_basestats":
+                return 200, basestats_result(basestats)
+
+            ranges = get_ranges(pokemon=request["pokemon"], generation=generation, level=request["level"])
+            return 200, {**basestats_result(basestats), **ranges_result(ranges)}
+        except (KeyError, TypeError, ValueError) as e:
+            return 422, {"error": _describe(e)}
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "endpoints": {path: stats.summary() for path, stats in self.stats.items()},
+            "batches": {
+                "count": self.batcher.batches,
+                "mean_size": round(self.batcher.rows / self.batcher.batches, 2) if self.batcher.batches else None,
+            },
+        }
+
+
+def serve(port: int = 8765, batch_window: float = 0.002, max_batch: int = 512) -> None:
+    """Run the service on localhost until interrupted."""
+    try:
+        asyncio.run(Service(batch_window, max_batch).serve(port))
+    except KeyboardInterrupt:
+        pass
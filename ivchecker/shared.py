@@ -0,0 +1,170 @@
+from __future__ import annotations
+import json
+import os
+import sys
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+# Processes started with this variable set to a segment's name (e.g., service
+# replicas) use that segment's tables instead of loading their own.
+SHARED_TABLES_ENV = "IVCHECKER_SHARED_TABLES"
+
+# arrays start on cache-line boundaries
+_ALIGN = 64
+
+# the length of the JSON header at the start of the segment
+_HEADER_SIZE = np.dtype(np.uint64).itemsize
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+class SharedTables:
+    """Named arrays published once into a shared memory segment.
+
+    The segment starts with a JSON header giving each array's dtype, shape and
+    offset, so that another process can attach to it by name alone. Attached
+    arrays are read-only views into the segment, not copies.
+    """
+
+    def __init__(self, segment: SharedMemory, arrays: dict[str, np.ndarray], owner: bool):
+        self.segment = segment
+        self.arrays = arrays
+        self.owner = owner
+
+    @property
+    def name(self) -> str:
+        return self.segment.name
+
+    @classmethod
+    def publish(cls, arrays: dict[str, np.ndarray], name: str | None = None) -> SharedTables:
+        """Copy the arrays into a new segment. The caller owns the segment and should unlink it when done."""
+        # multiprocessing is slow to import, and most processes never share anything
+        from multiprocessing.shared_memory import SharedMemory
+
+        layout, offset = [], 0
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            layout.append({"name": key, "dtype": array.dtype.str, "shape": array.shape, "offset": offset})
+            offset = _aligned(offset + array.nbytes)
+
+        # The header holds offsets relative to the first array, which starts
+        # after the header itself.
+        header = json.dumps(layout).encode()
+        start = _aligned(_HEADER_SIZE + len(header))
+
+        segment = SharedMemory(name=name, create=True, size=max(start + offset, 1))
+        segment.buf[:_HEADER_SIZE] = np.uint64(len(header)).tobytes()
+        segment.buf[_HEADER_SIZE:_HEADER_SIZE + len(header)] = header
+
+        for entry, array in zip(layout, arrays.values()):
+            entry["offset"] += start
+            _view(segment, entry, writeable=True)[...] = array
+
+        return cls(segment, {entry["name"]: _view(segment, entry) for entry in layout}, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, track: bool = True) -> SharedTables:
+        """Attach to a published segment by name.
+
+        A process that wasn't started by the publisher (and so doesn't share its
+        resource tracker) should pass track=False, or the segment is unlinked
+        when that process exits.
+        """
+        from multiprocessing import resource_tracker
+        from multiprocessing.shared_memory import SharedMemory
+
+        if track or sys.version_info >= (3, 13):
+            segment = SharedMemory(name=name, **({} if track else {"track": False}))
+        else:
+            segment = SharedMemory(name=name)
+            resource_tracker.unregister(segment._name, "shared_memory")
+
+        header_size = int(np.frombuffer(segment.buf[:_HEADER_SIZE], dtype=np.uint64)[0])
+        layout = json.loads(bytes(segment.buf[_HEADER_SIZE:_HEADER_SIZE + header_size]))
+        start = _aligned(_HEADER_SIZE + header_size)
+
+        arrays = {}
+        for entry in layout:
+            entry["offset"] += start
+            arrays[entry["name"]] = _view(segment, entry)
+
+        return cls(segment, arrays, owner=False)
+
+    def close(self) -> None:
+        """Detach from the segment. The arrays can't be used after this."""
+        self.arrays = {}
+        self.segment.close()
+
+    def unlink(self) -> None:
+        """Detach from the segment and destroy it, if this process published it."""
+        self.close()
+        if self.owner:
+            self.segment.unlink()
+
+    def __enter__(self) -> SharedTables:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.unlink()
+
+
+def _view(segment: SharedMemory, entry: dict, writeable: bool = False) -> np.ndarray:
+    array = np.ndarray(tuple(entry["shape"]), dtype=np.dtype(entry["dtype"]), buffer=segment.buf, offset=entry["offset"])
+    array.flags.writeable = writeable
+    return array
+
+
+_attached: SharedTables | None = None
+
+
+def attach_tables(name: str, track: bool = True) -> SharedTables:
+    """Use the reference tables in the named segment for the rest of this process.
+
+    This has to happen before the dataset is first loaded (or the caches of
+    get_dataset and get_basestat_table have to be cleared afterwards).
+    """
+    global _attached
+    _attached = SharedTables.attach(name, track=track)
+    return _attached
+
+
+def attached_tables() -> SharedTables | None:
+    """Return the reference tables this process is attached to, if any."""
+    if _attached is None and (name := os.environ.get(SHARED_TABLES_ENV)):
+        try:
+            attach_tables(name, track=False)
+        except (OSError, ValueError):
+            # If the segment has gone away, we can still load the data ourselves.
+            pass
+
+    return _attached
+
+
+def publish_tables(name: str | None = None) -> SharedTables:
+    """Publish this process's reference tables for other processes to attach to.
+
+    Besides the dataset's own arrays, the segment holds the base stat table for
+    every generation and the nature modifier matrix (in the order of the
+    dataset's natures). Attached processes look species up in these arrays
+    in place, and only copy out the small tables of natures, characteristics
+    and stat changes.
+    """
+    # The dataset and table load through attached_tables, so these are imported
+    # here rather than at the top of the module.
+    from ivchecker.dataset import get_dataset
+    from ivchecker.engine import Nature
+    from ivchecker.tables import get_basestat_table
+
+    dataset, table = get_dataset(), get_basestat_table()
+    arrays = dataset.to_arrays()
+
+    arrays["table_stats"] = table.stats
+    arrays["table_min_generation"] = np.array([table.min_generation], dtype=np.int16)
+    arrays["nature_modifiers"] = np.array([nature.modifiers for nature in Nature.read_all()], dtype=np.float64)
+
+    return SharedTables.publish(arrays, name=name)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+from math import prod
+from typing import Iterator, Sequence
+
+from ivchecker.engine import HP_PATTERNS, ODD_PATTERNS, Characteristic, HPType, Stat
+from ivchecker.ivset import IVSet
+
+# every one of the 64 parity patterns (see engine.HP_PATTERNS)
+ALL_PATTERNS = (1 << 64) - 1
+
+SPREAD_ORDERS = ("stats", "total")
+
+
+def iter_spreads(
+    ivs: Sequence[IVSet],
+    characteristic: Characteristic | None = None,
+    hidden_power_type: str = "",
+    order: str = "stats",
+    reverse: bool = False
+) -> Iterator[tuple[int, ...]]:
+    """ Yield every full IV spread (in Stat order) consistent with the possible
+    IVs of each stat (e.g., from check_ivs), the characteristic and the hidden
+    power type.
+
+    With order="stats", the spreads come in order of their IVs, HP first; with
+    order="total", in order of their total, ties going by their IVs. reverse
+    puts the highest first. As in check_ivs, the characteristic's stat only
+    has to be at least as high as every other (ties aren't broken).
+
+    The spreads are found by a depth-first search over the stats, so only the
+    current path is held in memory. Each step keeps track of the parity
+    patterns still giving the hidden power type and, when ordered by total,
+    of whether the remaining stats can still make up that total.
+    """
+    if order not in SPREAD_ORDERS:
+        raise ValueError(f"Unknown spread order: {order!r}")
+
+    domains = list(ivs)
+    high = -1
+    if characteristic:
+        high = list(Stat).index(characteristic.high_stat)
+        domains[high] = domains[high].congruent(characteristic.residue, 5)
+
+    if not all(domains):
+        return
+
+    patterns = HP_PATTERNS[HPType.from_name(hidden_power_type)] if hidden_power_type else ALL_PATTERNS
+    # before the characteristic's IV is chosen, nothing can exceed its highest possibility
+    cap = domains[high].max if high >= 0 else 31
+    bounds = _suffix_bounds(domains, high) if order == "total" else []
+
+    def extend(i: int, spread: tuple[int, ...], cap: int, patterns: int, remaining: int | None) -> Iterator[tuple[int, ...]]:
+        if i == 6:
+            yield spread
+            return
+
+        if i == high:
+            options = IVSet(domains[i].mask & ~((1 << max(spread, default=0)) - 1))
+        else:
+            options = domains[i].at_most(cap)
+
+        if remaining is not None:
+            if i == 5:
+                # the last IV is whatever is left of the total
+                options = options & IVSet.of([remaining]) if 0 <= remaining < 32 else IVSet()
+            elif i != high:
+                lo, hi = bounds[cap][i + 1]
+                options = IVSet(options.mask & _between(remaining - hi, remaining - lo))
+
+        for iv in (reversed(list(options)) if reverse else options):
+            narrowed = patterns & (ODD_PATTERNS[i] if iv & 1 else ~ODD_PATTERNS[i])
+            if not narrowed:
+                continue
+
+            if i == high and remaining is not None and i < 5:
+                lo, hi = bounds[iv][i + 1]
+                if not lo <= remaining - iv <= hi:
+                    continue
+
+            yield from extend(
+                i + 1, spread + (iv,), iv if i == high else cap, narrowed,
+                None if remaining is None else remaining - iv
+            )
+
+    if order == "stats":
+        yield from extend(0, (), cap, patterns, None)
+        return
+
+    lo, hi = bounds[cap][0]
+    for total in (range(hi, lo - 1, -1) if reverse else range(lo, hi + 1)):
+        yield from extend(0, (), cap, patterns, total)
+
+
+def count_spreads(ivs: Sequence[IVSet], characteristic: Characteristic | None = None, hidden_power_type: str = "") -> int:
+    """ Count the spreads iter_spreads would yield, without enumerating them.
+
+    Once the parity of every IV is fixed, the stats are independent, so the
+    count is a sum over the parity patterns giving the hidden power type of a
+    product of per-stat counts. With a characteristic, that sum is taken once
+    for each value its stat could have, capping the others at that value.
+    """
+    patterns = HP_PATTERNS[HPType.from_name(hidden_power_type)] if hidden_power_type else ALL_PATTERNS
+    if not characteristic:
+        return _count_patterns(ivs, patterns)
+
+    high = list(Stat).index(characteristic.high_stat)
+    total = 0
+    for iv in ivs[high].congruent(characteristic.residue, 5):
+        capped = [IVSet.of([iv]) if i == high else opts.at_most(iv) for i, opts in enumerate(ivs)]
+        total += _count_patterns(capped, patterns)
+
+    return total
+
+
+def _count_patterns(ivs: Sequence[IVSet], patterns: int) -> int:
+    """ Count the spreads drawn from the IVs whose parities follow one of the patterns. """
+    if patterns == ALL_PATTERNS:
+        return prod(len(opts) for opts in ivs)
+
+    evens = [len(opts.evens) for opts in ivs]
+    odds = [len(opts.odds) for opts in ivs]
+
+    total = 0
+    while patterns:
+        lowest = patterns & -patterns
+        pattern = lowest.bit_length() - 1
+        total += prod(odds[i] if pattern >> i & 1 else evens[i] for i in range(6))
+        patterns ^= lowest
+
+    return total
+
+
+def _suffix_bounds(domains: list[IVSet], high: int) -> list[list[tuple[int, int]]]:
+    """ For each cap and stat, bound the total of the IVs of that stat onwards,
+    none of them (but the characteristic's) exceeding the cap. Crossed bounds
+    (lo > hi) mean some stat has no IVs under the cap.
+    """
+    bounds = []
+    for cap in range(32):
+        lo, hi = 0, 0
+        suffix = [(lo, hi)]
+        for i in reversed(range(6)):
+            options = domains[i] if i == high else domains[i].at_most(cap)
+            lo, hi = (lo + options.min, hi + options.max) if options and lo <= hi else (1, 0)
+            suffix.append((lo, hi))
+
+        bounds.append(suffix[::-1])
+
+    return bounds
+
+
+def _between(lo: int, hi: int) -> int:
+    """ The IVSet mask of the IVs in [lo, hi]. """
+    lo, hi = max(lo, 0), min(hi, 31)
+    return ((1 << (hi + 1)) - 1) ^ ((1 << lo) - 1) if lo <= hi else 0
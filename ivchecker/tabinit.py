@@ -1,21 +1,71 @@
+from functools import lru_cache, reduce
+from operator import or_
+from typing import Callable, Iterable
+
 from ivchecker.configuration import Config
 from ivchecker.engine import Characteristic, HPType, Nature, Stat, get_basestats
 from ivchecker.gui import (
     error,
     Button,
+    Debouncer,
     Dropdown,
     EditableWidget,
     Frame,
     Label,
     Spinbox,
     Textbox,
+    Worker,
 )
-from ivchecker.runners import check_ivs, get_ranges
+from ivchecker.runners import check_ivs, check_ivs_all_natures, get_ranges
+from ivchecker.spreads import count_spreads
 from ivchecker.utils import format_ivs
 
 GENERATION_OPTIONS = ("9・IX", "8・VIII", "7・VII",
                       "6・VI", "5・V", "4・IV", "3・III")
 
+HP_TYPE_OPTIONS = ("",) + tuple(sorted(t.name.title() for t in HPType))
+
+
+@lru_cache(maxsize=None)
+def nature_options() -> tuple[str, ...]:
+    """ The options of the nature dropdown, e.g., "Jolly (+Spe/-SpA)". """
+    natures, _ = Nature.table()
+    return ("",) + tuple(sorted(map(str, natures)))
+
+
+@lru_cache(maxsize=None)
+def characteristic_options() -> tuple[str, ...]:
+    """ The options of the characteristic dropdown. """
+    return ("",) + tuple(sorted(Characteristic.read_all()))
+
+
+def _ignore(message: str) -> None:
+    pass
+
+
+def _watch_inputs(
+    frame: Frame,
+    widgets: Iterable[EditableWidget],
+    worker: Worker,
+    recalc: Callable[[Callable[[str], None]], None],
+    config: Config
+) -> None:
+    """ Changing any of the widgets makes the worker's current calculation stale,
+    so it's cancelled. In live mode, `recalc` is called again once typing pauses,
+    with a report function that stays quiet, as incomplete input isn't worth a popup.
+
+    `recalc` runs its calculation on the worker thread, so that mustn't touch the UI.
+    """
+    live = Debouncer(frame, config.ui.live_update_delay_ms, lambda: recalc(_ignore))
+
+    def input_changed():
+        worker.cancel()
+        if config.ui.live_update:
+            live.trigger()
+
+    for widget in widgets:
+        widget.on_change(input_changed)
+
 
 def initialize_check_tab(frame: Frame, *, config: Config) -> None:
     form: dict[str, EditableWidget] = dict()
@@ -47,17 +97,14 @@ def initialize_check_tab(frame: Frame, *, config: Config) -> None:
             .grid(row=5, column=j, opad=(0, 2))
         frame.form[f"ev_{stat.value}"].value = "0"
     
-    nature_options = ("",) + tuple(sorted(map(str, Nature.read_all())))
-    Label(master=frame, text="Nature*", anchor="e").grid(6, 1, columnspan=2, opad=(5, 0))
-    frame.form["nature"] = Dropdown(master=frame, options=nature_options).grid(6, 3, columnspan=4, opad=(0, 2))
+    Label(master=frame, text="Nature", anchor="e").grid(6, 1, columnspan=2, opad=(5, 0))
+    frame.form["nature"] = Dropdown(master=frame, options=nature_options()).grid(6, 3, columnspan=4, opad=(0, 2))
     
-    char_options = ("",) + tuple(sorted(Characteristic.read_all()))
     Label(master=frame, text="Characteristic", anchor="e").grid(7, 1, columnspan=2, opad=(5, 2))
-    frame.form["char"] = Dropdown(master=frame, options=char_options).grid(7, 3, columnspan=4, opad=(0, 2))
+    frame.form["char"] = Dropdown(master=frame, options=characteristic_options()).grid(7, 3, columnspan=4, opad=(0, 2))
     
-    hp_types = ("",) + tuple(sorted(t.name.title() for t in HPType))
     Label(master=frame, text="HP Type", anchor="e").grid(8, 1, columnspan=2, opad=(5, 2))
-    frame.form["hp-type"] = Dropdown(master=frame, options=hp_types).grid(8, 3, columnspan=4, opad=(0, 2))
+    frame.form["hp-type"] = Dropdown(master=frame, options=HP_TYPE_OPTIONS).grid(8, 3, columnspan=4, opad=(0, 2))
     
     Label(master=frame, text="IVs", anchor="e").grid(11, 0, opad=(5, 0))
     for j, stat in enumerate(Stat, start=1):
@@ -65,13 +112,20 @@ def initialize_check_tab(frame: Frame, *, config: Config) -> None:
         frame.form[f"iv_{stat.value}"] = Textbox(master=frame, width=7, justify="center", relief=relief) \
             .grid(row=11, column=j)
 
-    def check_button_callback():
+    # with no nature given, this lists the natures that fit, and otherwise it
+    # counts the full spreads that fit
+    summary_label = Label(master=frame, text="", anchor="center").grid(12, 1, columnspan=6, opad=(0, 5))
+
+    worker = Worker(frame)
+
+    def check_button_callback(report: Callable[[str], None] = error):
         ui: dict[str, EditableWidget] = frame.form
         
         # clear the IV fields
         for stat in Stat:
             widget = ui[f"iv_{stat.value}"]
             widget.clear()
+        summary_label.text = ""
             
         # read generation from dropdown, converting, e.g. "4・IV" -> 4
         gen: int = int(ui["generation"].value.split("・")[0])
@@ -87,44 +141,82 @@ def initialize_check_tab(frame: Frame, *, config: Config) -> None:
             try:
                 actual_stats.append(int(actual))
             except ValueError:
-                error(f"Invalid value for {stat.value}: {actual!r}")
+                worker.cancel()
+                report(f"Invalid value for {stat.value}: {actual!r}")
                 return
                 
             try:
                 evs.append(int(ev))
             except ValueError:
-                error(f"Invalid value for {stat.value} EV: {ev!r}")
+                worker.cancel()
+                report(f"Invalid value for {stat.value} EV: {ev!r}")
                 return
         
         # read level
-        level = int(ui["level"].value)
+        try:
+            level = int(ui["level"]._raw_value)
+        except ValueError:
+            worker.cancel()
+            report(f"Cannot parse level: {ui['level']._raw_value!r}")
+            return
         
         # read nature from textbox, but remove the +/- comment
-        nature_name, *_ = ui["nature"].value.split()
+        nature_name = ui["nature"].value.partition(" (")[0]
         
-        # read characteristic from textbox, but convert to a Characteristic object
         description = ui["char"].value
-        char = Characteristic.get(description) if description else None
-        
-        try:
+        pokemon = ui["pokémon"].value
+        hidden_power_type = ui["hp-type"].value
+
+        def calculate():
+            # convert the characteristic to a Characteristic object
+            char = Characteristic.get(description) if description else None
+
+            # without a nature, try them all
+            if not nature_name:
+                return check_ivs_all_natures(
+                    pokemon=pokemon,
+                    generation=gen,
+                    level=level,
+                    actual_stats=tuple(actual_stats),
+                    evs=tuple(evs),
+                    characteristic=char,
+                    hidden_power_type=hidden_power_type
+                )
+
             ivs = check_ivs(
-                pokemon=ui["pokémon"].value,
+                pokemon=pokemon,
                 generation=gen,
                 level=level,
                 actual_stats=tuple(actual_stats),
                 evs=tuple(evs),
                 nature_name=nature_name,
                 characteristic=char,
-                hidden_power_type=ui["hp-type"].value
+                hidden_power_type=hidden_power_type
             )
-        except ValueError as e:
-            error(e)
-            return
-        
-        # and now output back to the ui
-        for stat, iv in zip(Stat, ivs):
-            ui[f"iv_{stat.value}"].value = format_ivs(iv)
-            
+            return ivs, count_spreads(ivs, char, hidden_power_type)
+
+        def show(result):
+            # without a nature, show the IVs possible under any of the natures that fit
+            if isinstance(result, dict):
+                if not result:
+                    report("No nature fits these stats. Check entered stats for errors.")
+                    return
+
+                summary_label.text = "Possible natures: " + ", ".join(result)
+                result = [reduce(or_, options) for options in zip(*result.values())]
+            else:
+                result, count = result
+                if count:
+                    summary_label.text = f"{count:,} possible spread{'s' if count != 1 else ''}"
+
+            # and now output back to the ui
+            for stat, iv in zip(Stat, result):
+                ui[f"iv_{stat.value}"].value = format_ivs(iv)
+
+        worker.submit(calculate, on_done=show, on_error=report)
+
+    inputs = [widget for name, widget in frame.form.items() if not name.startswith("iv_")]
+    _watch_inputs(frame, inputs, worker, check_button_callback, config)
 
     Button(master=frame, text="Calculate IVs", callback=check_button_callback, style="Accent.TButton") \
         .grid(row=9, column=1, columnspan=6, opad=(0, 8))
@@ -168,7 +260,9 @@ def initialize_ranges_tab(frame: Frame, *, config: Config) -> None:
         
     frame.form["bst"] = Textbox(master=frame, relief=relief, width=8).grid(11, 1)
 
-    def ranges_button_callback():
+    worker = Worker(frame)
+
+    def ranges_button_callback(report: Callable[[str], None] = error):
         ui: dict[str, EditableWidget] = frame.form
 
         # clear the stat fields
@@ -181,12 +275,7 @@ def initialize_ranges_tab(frame: Frame, *, config: Config) -> None:
 
         # read generation from dropdown, converting, e.g. "4・IV" -> 4
         gen: int = int(ui["generation"].value.split("・")[0], 10)
-        basestats = get_basestats(pokemon=ui["pokémon"].value, generation=gen)
-        
-        # output basestats to UI first
-        for stat, base in zip(Stat, basestats):
-            ui[f"base_{stat.value}"].value = str(base)
-        ui["bst"].value = f"BST:{sum(basestats)}"
+        pokemon = ui["pokémon"].value
 
         # level
         assert isinstance(ui["level"], Spinbox)
@@ -194,20 +283,29 @@ def initialize_ranges_tab(frame: Frame, *, config: Config) -> None:
             level_val = ui["level"]._raw_value
             level = int(level_val)
         except ValueError:
-            error(f"Cannot parse level: {ui['level']._raw_value!r}")
+            worker.cancel()
+            report(f"Cannot parse level: {ui['level']._raw_value!r}")
             return
 
-        try:
-            ranges = get_ranges(pokemon=ui["pokémon"].value, generation=gen, level=level)
-        except ValueError as e:
-            error(e)
-            return
+        def calculate():
+            basestats = get_basestats(pokemon=pokemon, generation=gen)
+            return basestats, get_ranges(pokemon=pokemon, generation=gen, level=level)
+
+        def show(result):
+            basestats, ranges = result
+
+            # output data back to ui
+            for stat, base, (min, max0, max252) in zip(Stat, basestats, ranges):
+                ui[f"base_{stat.value}"].value = str(base)
+                ui[f"min_{stat.value}"].value = str(min)
+                ui[f"max0_{stat.value}"].value = str(max0)
+                ui[f"max252_{stat.value}"].value = str(max252)
+            ui["bst"].value = f"BST:{sum(basestats)}"
+
+        worker.submit(calculate, on_done=show, on_error=report)
 
-        # output data back to ui
-        for stat, base, (min, max0, max252) in zip(Stat, basestats, ranges):
-            ui[f"min_{stat.value}"].value = str(min)
-            ui[f"max0_{stat.value}"].value = str(max0)
-            ui[f"max252_{stat.value}"].value = str(max252)
+    inputs = [frame.form[name] for name in ("generation", "pokémon", "level")]
+    _watch_inputs(frame, inputs, worker, ranges_button_callback, config)
 
     Button(master=frame, text="Calculate Ranges", callback=ranges_button_callback, style="Accent.TButton") \
         .grid(2, 0, columnspan=5, opad=(0, 20))
@@ -286,11 +384,11 @@ def initialize_info_tab(frame: Frame, *, config: Config) -> None:
         Label(frame, text=f"{stat.value}↑", **cfg) \
             .grid(row=i, column=0, ipad=(10, 5), opad=(5, 0))
 
-    natures = tuple(Nature.read_all())
+    natures, _ = Nature.table()
+    by_effect = {(nature.raised, nature.lowered): nature for nature in natures}
     for row, raised in enumerate(list(Stat)[1:], start=1):
         for col, lowered in enumerate(list(Stat)[1:], start=1):
             fg = DIM_COLOR if raised == lowered else LIGHT_COLOR
-            for nature in natures:
-                if nature.raised == raised and nature.lowered == lowered:
-                    Label(frame, text=nature.name.title(),
-                          anchor="c", foreground=fg).grid(row=row, column=col, ipad=(10, 0))
+            nature = by_effect[raised, lowered]
+            Label(frame, text=nature.name.title(),
+                  anchor="c", foreground=fg).grid(row=row, column=col, ipad=(10, 0))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Mapping
+import numpy as np
+
+from ivchecker import instrument
+from ivchecker.configuration import GenerationConfig
+from ivchecker.dataset import Dataset, SortedIndex, get_dataset
+from ivchecker.shared import attached_tables
+from ivchecker.utils import SixInts, config
+
+
+class BaseStatTable:
+    """The base stats of every species in every supported generation.
+
+    Stat changes are resolved when the table is built, so that a lookup is a
+    single index into a (species, generation, stat) array.
+    """
+
+    def __init__(self, index: Mapping[str, int], stats: np.ndarray, min_generation: int):
+        self.index = index
+        self.stats = stats
+        self.min_generation = min_generation
+
+    @classmethod
+    def from_dataset(cls, dataset: Dataset, generations: GenerationConfig) -> BaseStatTable:
+        gens = range(generations.min_supported, generations.most_recent + 1)
+        index = {name: row for row, name in enumerate(dataset.basestats)}
+
+        modern = np.array(list(dataset.basestats.values()), dtype=np.int16).reshape(-1, 6)
+        stats = np.repeat(modern[:, None, :], len(gens), axis=1)
+
+        # A change applies up to and including its "last gen", so the earliest
+        # one that hasn't expired yet is the one in effect. Applying them from
+        # latest to earliest lets the earlier ones win where they overlap.
+        for name, changes in dataset.stat_changes.items():
+            for last_gen in sorted(changes, reverse=True):
+                stats[index[name], :max(last_gen - generations.min_supported + 1, 0)] = changes[last_gen]
+
+        return cls(index, stats, generations.min_supported)
+
+    @property
+    def generations(self) -> range:
+        return range(self.min_generation, self.min_generation + self.stats.shape[1])
+
+    def row(self, pokemon: str) -> int:
+        """Return the table row for the given Pokémon, raising KeyError if it is unknown."""
+        return self.index[pokemon.lower()]
+
+    def column(self, generation: int) -> int:
+        """Return the table column for the given generation."""
+        if generation not in self.generations:
+            raise ValueError(f"Generation {generation} is not supported.")
+
+        return generation - self.min_generation
+
+    def get(self, pokemon: str, generation: int) -> SixInts:
+        """Return the basestats for the given Pokémon in the given generation."""
+        return tuple(self.stats[self.row(pokemon), self.column(generation)].tolist())
+
+
+@lru_cache(maxsize=None)
+def get_basestat_table() -> BaseStatTable:
+    """Return the process-wide base stat table, building it on first use."""
+    instrument.count("basestat table builds")
+    shared = attached_tables()
+    if shared is not None:
+        index = SortedIndex(shared.arrays["species_keys"], shared.arrays["species_rows"])
+        return BaseStatTable(index, shared.arrays["table_stats"], int(shared.arrays["table_min_generation"][0]))
+
+    return BaseStatTable.from_dataset(get_dataset(), config.generations)
@@ -1,11 +1,17 @@
+import time
+
+# when the app started, for --time-to-first-paint
+STARTED = time.perf_counter()
+
+from functools import partial
 from pathlib import Path
 import sys
 import tkinter as tk
 from tkinter import ttk
 
-from ivchecker.configuration import Config
 from ivchecker.gui import TabbedDisplay, Window
 from ivchecker.tabinit import initialize_basestat_tab, initialize_check_tab, initialize_ranges_tab, initialize_info_tab
+from ivchecker.utils import config
 
 __version__ = '2.2.0'
 
@@ -18,8 +24,6 @@ def main():
         print(__version__)
         return
 
-    config = Config.from_yaml(HERE / "config.yaml")
-
     window = Window(size=(450, 470),
                     title=f"Pokémon IV Checker v{__version__}")
     window.set_icon(config.paths.icon)
@@ -28,15 +32,21 @@ def main():
     window._proxy.call("source", "assets/forest-dark.tcl")
     ttk.Style().theme_use("forest-dark")
 
-    # Create the tab display and its tabs.
+    # Create the tab display and its tabs. Each tab's contents are only built
+    # once it's first selected, so that only the first is built at startup.
     tab_display = TabbedDisplay(master=window)
     tab_display.pack(expand=True, fill="both")
-    
-    tabs = tab_display.add_tabs("Check IVs", "Show Ranges", "Info")
+
+    tab_display.add_tabs("Check IVs", "Show Ranges", "Info")
     tab_initializers = [initialize_check_tab, initialize_ranges_tab, initialize_info_tab]
-    
-    for tab, init in zip(tabs, tab_initializers):
-        init(tab, config=config)
+    tab_display.build_lazily([partial(init, config=config) for init in tab_initializers])
+
+    if "--time-to-first-paint" in sys.argv:
+        # draw the window, report how long it took to get here, and quit
+        window._proxy.update()
+        print(f"time to first paint: {(time.perf_counter() - STARTED) * 1000:.1f} ms")
+        window._proxy.destroy()
+        return
 
     # Actually run the application
     window.run()
@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ivchecker.engine import Characteristic, Nature, Stat, calculate_stat, get_all_pokemon_names, get_basestats
+from ivchecker.runners import BATCH_COLUMNS, check_ivs, check_ivs_batch
+
+
+def observations(n: int, seed: int) -> list[dict]:
+    """Rows of stats from random spreads, some of them off by one, with random filters."""
+    rng = random.Random(seed)
+    names = get_all_pokemon_names()
+    natures = [nature.name for nature in Nature.read_all()]
+    characteristics = list(Characteristic.read_all())
+
+    rows = []
+    for i in range(n):
+        pokemon, generation, level = rng.choice(names), rng.randint(3, 9), rng.randint(1, 100)
+        nature = Nature.from_name(rng.choice(natures))
+        ivs = [rng.randint(0, 31) for _ in Stat]
+        evs = [rng.choice([0, 252, rng.randint(0, 252)]) for _ in Stat]
+        stats = [
+            calculate_stat(level, base, iv, ev, nature % stat, stat) + (rng.randint(-1, 1) if i % 4 == 0 else 0)
+            for base, iv, ev, stat in zip(get_basestats(pokemon, generation), ivs, evs, Stat)
+        ]
+
+        row = {
+            "pokemon": pokemon.upper() if i % 7 == 0 else pokemon, "generation": generation, "level": level,
+            "nature": nature.name,
+            "characteristic": rng.choice(characteristics) if i % 2 else None,
+            "hidden_power_type": rng.choice(["", "fire", "dark"]) if i % 3 else None,
+        }
+        for stat, value, ev in zip(Stat, stats, evs):
+            row[f"stat_{stat.value}"], row[f"ev_{stat.value}"] = value, ev
+        rows.append(row)
+
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_batch_matches_check_ivs(seed):
+    rows = observations(300, seed)
+    masks = check_ivs_batch(pd.DataFrame(rows))
+
+    for row, row_masks in zip(rows, masks.tolist()):
+        char = row["characteristic"]
+        try:
+            expected = check_ivs(
+                row["pokemon"], row["generation"], row["level"],
+                tuple(row[f"stat_{stat.value}"] for stat in Stat), row["nature"],
+                tuple(row[f"ev_{stat.value}"] for stat in Stat),
+                Characteristic.get(char) if char else None, row["hidden_power_type"] or ""
+            )
+        except ValueError:
+            expected = None
+
+        if expected is None or not all(expected):
+            # Inconsistent rows leave some stat without IVs, though what the
+            # other stats were narrowed to by then can differ.
+            assert not all(row_masks)
+        else:
+            assert row_masks == [ivs.mask for ivs in expected]
+
+
+@pytest.mark.parametrize("optional", [(), ("characteristic",), ("characteristic", "hidden_power_type")])
+def test_empty_batch(optional):
+    empty = pd.DataFrame(columns=[*BATCH_COLUMNS, *optional])
+    assert check_ivs_batch(empty).shape == (0, 6)
+    assert check_ivs_batch({column: [] for column in (*BATCH_COLUMNS, *optional)}).shape == (0, 6)
+
+
+def test_blank_optional_columns_are_ignored():
+    rows = observations(20, seed=5)
+    without = pd.DataFrame(rows).drop(columns=["characteristic", "hidden_power_type"])
+    blank = without.assign(characteristic=[None] * len(rows), hidden_power_type=[np.nan] * len(rows))
+
+    np.testing.assert_array_equal(check_ivs_batch(without), check_ivs_batch(blank))
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from ivchecker import cache
+from ivchecker.cache import MANIFEST, ArrayCache
+from ivchecker.dataset import Dataset
+from ivchecker.utils import ROOT, config
+
+PATHS = config.paths
+NAMES = (PATHS.basestats, PATHS.statchanges, PATHS.natures, PATHS.characteristics)
+
+
+@pytest.fixture
+def built(tmp_path) -> ArrayCache:
+    """A cache compiled from a copy of the data files, which the tests are free to change."""
+    for name in NAMES:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(ROOT / name, tmp_path / name)
+
+    array_cache = ArrayCache(tmp_path / "cache", [tmp_path / name for name in NAMES])
+    array_cache.save(Dataset.from_csv(tmp_path, PATHS).to_arrays())
+    return array_cache
+
+
+def manifest(array_cache: ArrayCache) -> dict:
+    return json.loads((array_cache.directory / MANIFEST).read_text())
+
+
+def test_saved_arrays_load_back(built):
+    arrays = built.load()
+    assert arrays is not None
+    expected = Dataset.from_csv(ROOT, PATHS).to_arrays()
+    assert set(arrays) == set(expected)
+    assert all(np.array_equal(arrays[name], expected[name]) for name in expected)
+
+    # no temporary files are left behind
+    assert not list(built.directory.glob("*.tmp"))
+
+
+def test_touching_a_source_only_records_its_mtime(built):
+    source = built.sources[0]
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert built.load() is not None
+    assert manifest(built)["sources"][str(source)]["mtime_ns"] == stat.st_mtime_ns + 10**9
+    assert built.load() is not None
+
+
+def test_changing_a_source_makes_the_cache_stale(built):
+    source = built.sources[0]
+    text = source.read_text()
+    assert "bulbasaur,45," in text
+    source.write_text(text.replace("bulbasaur,45,", "bulbasaur,46,", 1))
+    assert built.load() is None
+
+
+def test_a_new_version_makes_the_cache_stale(built, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_VERSION", cache.CACHE_VERSION + 1)
+    assert built.load() is None
+
+
+def test_an_unwritable_directory_is_ignored(built, tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    unwritable = ArrayCache(blocker / "cache", built.sources)
+
+    unwritable.save({"numbers": np.arange(3)})
+    assert unwritable.load() is None
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from ivchecker.cli import main
+
+# the readme's example: a level 50 Jolly Garchomp with 0 EVs and perfect IVs
+STATS = ["183", "150", "115", "90", "105", "134"]
+
+
+@pytest.mark.parametrize("level", ["0", "101", "-5", "fifty"])
+@pytest.mark.parametrize("command", [
+    ["check", "garchomp", "-s", *STATS, "-n", "Jolly"],
+    ["ranges", "garchomp"],
+    ["search", "-s", *STATS],
+])
+def test_level_out_of_range_is_a_usage_error(command, level, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main([*command, "-l", level])
+
+    assert exit.value.code == 2
+    assert "level must be a whole number from 1 to 100" in capsys.readouterr().err
+
+
+def test_check(capsys):
+    assert main(["check", "garchomp", "-l", "50", "-s", *STATS, "-n", "Jolly"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["level"] == 50 and "error" not in result
+    assert result["ivs"] == {stat: [30, 31] for stat in ("HP", "Atk", "Def", "SpA", "SpD", "Spe")}
+    assert result["formatted"] == {stat: "30-31" for stat in ("HP", "Atk", "Def", "SpA", "SpD", "Spe")}
@@ -0,0 +1,134 @@
+from itertools import product
+from math import prod
+import random
+
+import pytest
+
+from ivchecker.constraints import (
+    Constraint, JudgedRange, KnownCharacteristic, KnownHiddenPower, KnownParity, ObservedStats, propagate
+)
+from ivchecker.engine import Characteristic, HPType, Nature, Stat, calculate_stat, get_all_pokemon_names, get_basestats
+from ivchecker.ivset import IVSet
+from ivchecker.runners import STAT_FILTERS, check_ivs
+
+# the order characteristics break ties for the highest IV in
+TIE_ORDER = (Stat.HP, Stat.ATK, Stat.DEF, Stat.SPE, Stat.SPA, Stat.SPD)
+
+
+def evidence(seed: int) -> tuple[dict, list[Constraint]]:
+    """A random Pokémon's check_ivs arguments, and the constraints they stand for plus some random extra evidence.
+    Half the time, the characteristic and hidden power type come from the Pokémon's real IVs.
+    """
+    rng = random.Random(seed)
+    pokemon, level = rng.choice(get_all_pokemon_names()), rng.randint(1, 100)
+    nature = rng.choice(list(Nature.read_all()))
+    basestats = get_basestats(pokemon, 9)
+    ivs = [rng.randint(0, 31) for _ in Stat]
+    evs = tuple(rng.choice([0, 4, 252, rng.randint(0, 252)]) for _ in Stat)
+    stats = tuple(calculate_stat(level, base, iv, ev, nature % stat, stat) for base, iv, ev, stat in zip(basestats, ivs, evs, Stat))
+
+    characteristic = Characteristic.get(rng.choice(list(Characteristic.read_all())))
+    hp_type = rng.choice(list(HPType))
+    if seed % 2:
+        high = next(stat for stat in TIE_ORDER if ivs[list(Stat).index(stat)] == max(ivs))
+        description = next(c for c in Characteristic.read_all()
+                           if Characteristic.get(c).high_stat == high and Characteristic.get(c).residue == max(ivs) % 5)
+        characteristic, hp_type = Characteristic.get(description), HPType.get(*ivs)
+
+    extra: list[Constraint] = []
+    for stat, iv in zip(Stat, ivs):
+        if rng.random() < 0.3:
+            extra.append(KnownParity(stat, bool(iv & 1)))
+        if rng.random() < 0.3:
+            low = rng.randint(max(iv - 10, 0), iv)
+            extra.append(JudgedRange(stat, range(low, rng.randint(iv, 31) + 1)))
+
+    kwargs = dict(
+        pokemon=pokemon, generation=9, level=level, actual_stats=stats, nature_name=nature.name, evs=evs,
+        characteristic=characteristic, hidden_power_type=hp_type.name.lower(), constraints=extra,
+    )
+    constraints = [
+        ObservedStats(STAT_FILTERS["analytic"], level, basestats, stats, evs, nature),
+        KnownCharacteristic(characteristic),
+        KnownHiddenPower(hp_type),
+        *extra,
+    ]
+    return kwargs, constraints
+
+
+def fixpoint(constraints: list[Constraint]) -> dict[Stat, IVSet] | None:
+    """Apply every constraint in the given order until nothing changes, or None if the evidence is inconsistent."""
+    domains = {stat: IVSet.all() for stat in Stat}
+    while True:
+        before = domains
+        for constraint in constraints:
+            try:
+                domains = constraint.apply(domains)
+            except ValueError:
+                return None
+        if not all(domains.values()):
+            return None
+        if domains == before:
+            return domains
+
+
+def test_propagating_nothing_gives_fresh_domains():
+    domains = propagate([])
+    domains[Stat.HP] = IVSet()
+    assert propagate([]) == {stat: IVSet.all() for stat in Stat}
+
+
+def test_constraint_is_abstract():
+    with pytest.raises(TypeError):
+        Constraint()
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_propagate_matches_check_ivs_and_any_order(seed):
+    kwargs, constraints = evidence(seed)
+    try:
+        result = check_ivs(**kwargs)
+    except ValueError:
+        result = None
+    if result is not None and not all(result):
+        result = None
+
+    shuffled = constraints[:]
+    random.Random(seed).shuffle(shuffled)
+    reference = fixpoint(shuffled)
+
+    if reference is None:
+        assert result is None
+        return
+
+    assert result == tuple(reference[stat] for stat in Stat)
+    assert propagate(constraints) == reference
+
+
+@pytest.mark.parametrize("seed", range(0, 200, 7))
+def test_propagate_keeps_every_possible_spread(seed):
+    kwargs, constraints = evidence(seed)
+    observed = constraints[0].apply({stat: IVSet.all() for stat in Stat})
+    if not all(observed.values()) or prod(map(len, observed.values())) > 200_000:
+        pytest.skip("too many spreads to enumerate")
+
+    # Every IV of a spread satisfying all the evidence has to survive propagation.
+    try:
+        domains = propagate(constraints)
+    except ValueError:
+        domains = {stat: IVSet() for stat in Stat}
+
+    for spread in product(*observed.values()):
+        if all(_narrow(constraints, spread).values()):
+            assert all(iv in domains[stat] for stat, iv in zip(Stat, spread))
+
+
+def _narrow(constraints: list[Constraint], spread: tuple[int, ...]) -> dict[Stat, IVSet]:
+    """The spread's own domains after every constraint, which are all empty if it breaks any of them."""
+    domains = {stat: IVSet.of([iv]) for stat, iv in zip(Stat, spread)}
+    for constraint in constraints:
+        try:
+            domains = constraint.apply(domains)
+        except ValueError:
+            return {stat: IVSet() for stat in Stat}
+    return domains
@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+
+from ivchecker.curves import (
+    EV_STEPS, LEVELS, MODIFIERS, breakpoints, min_evs, min_evs_batch, stat_curves, wasted_evs, wasted_evs_batch
+)
+from ivchecker.engine import MAX_EV, Stat, calculate_stat, get_basestats
+
+STATS = list(Stat)
+
+
+def random_stat(rng: random.Random) -> tuple[int, int, int, float, Stat]:
+    """A random (level, base, iv, nature, stat), with no nature modifier for HP."""
+    stat = rng.choice(STATS)
+    nature = 1.0 if stat == Stat.HP else rng.choice(MODIFIERS.tolist())
+    return rng.randint(1, 100), rng.randint(1, 255), rng.randint(0, 31), nature, stat
+
+
+def test_stat_curves_match_calculate_stat():
+    basestats, ivs = get_basestats("garchomp", 9), (31, 0, 15, 31, 7, 30)
+    expected = [
+        [
+            [
+                [calculate_stat(level, base, iv, ev, 1.0 if stat == Stat.HP else modifier, stat)
+                 for base, iv, stat in zip(basestats, ivs, Stat)]
+                for modifier in MODIFIERS.tolist()
+            ]
+            for ev in EV_STEPS.tolist()
+        ]
+        for level in LEVELS.tolist()
+    ]
+    assert stat_curves(basestats, ivs).tolist() == expected
+
+
+def test_ev_queries_match_calculate_stat():
+    rng = random.Random(0)
+    for _ in range(2000):
+        level, base, iv, nature, stat = random_stat(rng)
+        stats = [calculate_stat(level, base, iv, ev, nature, stat) for ev in range(MAX_EV + 1)]
+
+        target = rng.randint(stats[0] - 3, stats[-1] + 3)
+        assert min_evs(level, base, iv, target, nature, stat) == next((ev for ev, value in enumerate(stats) if value >= target), None)
+
+        ev = rng.randint(0, MAX_EV)
+        assert wasted_evs(level, base, iv, ev, nature, stat) == ev - stats.index(stats[ev])
+
+        rises = [(ev, stats[ev]) for ev in range(4, MAX_EV + 1, 4) if stats[ev] > stats[ev - 4]]
+        assert [tuple(row) for row in breakpoints(level, base, iv, nature, stat).tolist()] == rises
+
+
+def test_batches_match_single_queries():
+    rng = np.random.default_rng(1)
+    n = 500
+    level = rng.integers(1, 101, n)
+    basestats, ivs = rng.integers(1, 256, (n, 6)), rng.integers(0, 32, (n, 6))
+    modifiers = np.column_stack([np.ones(n), rng.choice(MODIFIERS, (n, 5))])
+    targets, evs = rng.integers(1, 700, (n, 6)), rng.integers(0, MAX_EV + 1, (n, 6))
+
+    fewest, wasted = min_evs_batch(level, basestats, ivs, targets, modifiers), wasted_evs_batch(level, basestats, ivs, evs, modifiers)
+    for row in range(n):
+        for s, stat in enumerate(STATS):
+            args = int(level[row]), int(basestats[row, s]), int(ivs[row, s])
+            expected = min_evs(*args, int(targets[row, s]), float(modifiers[row, s]), stat)
+            assert fewest[row, s] == (-1 if expected is None else expected)
+            assert wasted[row, s] == wasted_evs(*args, int(evs[row, s]), float(modifiers[row, s]), stat)
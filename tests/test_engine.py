@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from ivchecker.engine import MAX_EV, Stat, calculate_stat, invert_stat, invert_stat_ev, invert_stat_evs
+
+MODIFIERS = (0.9, 1.0, 1.1)
+
+
+def cases(n: int, seed: int):
+    """(level, base, ev, nature, stat) combinations, always including levels 1 and 100."""
+    rng = random.Random(seed)
+    for i in range(n):
+        stat = rng.choice(list(Stat))
+        level = (1, 100)[i] if i < 2 else rng.randint(1, 100)
+        nature = 1.0 if stat == Stat.HP else rng.choice(MODIFIERS)
+        yield level, rng.randint(1, 255), rng.randint(0, MAX_EV), nature, stat
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_invert_stat_matches_scanning_every_iv(seed):
+    for level, base, ev, nature, stat in cases(2500, seed):
+        stats = [calculate_stat(level, base, iv, ev, nature, stat) for iv in range(32)]
+
+        # every stat reachable with some IV, and the values just outside them
+        for actual in range(min(stats) - 1, max(stats) + 2):
+            expected = [iv for iv, value in enumerate(stats) if value == actual]
+            assert list(invert_stat(level, base, actual, ev, nature, stat)) == expected, (level, base, actual, ev, nature, stat)
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_invert_stat_ev_matches_scanning_every_ev(seed):
+    for level, base, _, nature, stat in cases(300, seed):
+        for iv in (0, 15, 31):
+            stats = [calculate_stat(level, base, iv, ev, nature, stat) for ev in range(MAX_EV + 1)]
+            for actual in range(min(stats) - 1, max(stats) + 2):
+                expected = [ev for ev, value in enumerate(stats) if value == actual]
+                assert list(invert_stat_ev(level, base, actual, iv, nature, stat)) == expected
+
+
+def test_invert_stat_evs_matches_invert_stat_ev():
+    for level, base, ev, nature, stat in cases(300, 0):
+        actual = calculate_stat(level, base, 20, ev, nature, stat)
+        expected = {iv: invert_stat_ev(level, base, actual, iv, nature, stat) for iv in range(32)}
+        assert invert_stat_evs(level, base, actual, nature, stat) == {iv: evs for iv, evs in expected.items() if evs}
+
+
+@pytest.mark.parametrize("level", [0, -5, 101])
+def test_levels_out_of_range_are_rejected(level):
+    with pytest.raises(ValueError, match="Level"):
+        invert_stat(level, 100, 150, 0, 1.0, Stat.ATK)
+    with pytest.raises(ValueError, match="Level"):
+        invert_stat_evs(level, 100, 150, 1.0, Stat.HP)
+
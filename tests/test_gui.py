@@ -0,0 +1,172 @@
+from itertools import count
+from types import SimpleNamespace
+import threading
+import time
+
+import pytest
+
+from ivchecker.gui import Debouncer, TabbedDisplay, Worker
+from ivchecker.tabinit import _watch_inputs
+
+
+class FakeTk:
+    """Stands in for a widget's Tk proxy, without a display. after() queues the
+    callback on a fake clock, which only moves when the test advances it.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.scheduled: dict[str, tuple[int, object, tuple]] = {}
+        self.ids = count()
+        self.bindings = {}
+        self.current = 0
+
+    def after(self, ms, func, *args):
+        after_id = f"after#{next(self.ids)}"
+        self.scheduled[after_id] = (self.now + ms, func, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def advance(self, ms):
+        """Move the clock on, running whatever falls due (including anything scheduled meanwhile)."""
+        end = self.now + ms
+        while True:
+            due = [(when, after_id) for after_id, (when, _, _) in self.scheduled.items() if when <= end]
+            if not due:
+                break
+            when, after_id = min(due)
+            self.now = when
+            _, func, args = self.scheduled.pop(after_id)
+            func(*args)
+        self.now = end
+
+    def bind(self, event, callback):
+        self.bindings[event] = callback
+
+    def index(self, which):
+        assert which == "current"
+        return self.current
+
+
+class FakeWidget:
+    def __init__(self):
+        self._proxy = FakeTk()
+
+
+def pump(tk: FakeTk, until, timeout: float = 5.0) -> None:
+    """Advance the fake clock while the worker thread catches up, until the condition holds."""
+    deadline = time.monotonic() + timeout
+    while not until():
+        assert time.monotonic() < deadline, "timed out"
+        tk.advance(15)
+        time.sleep(0.001)
+
+
+def test_superseded_result_is_dropped():
+    owner, release = FakeWidget(), threading.Event()
+    worker = Worker(owner)
+    done, errors = [], []
+
+    def slow():
+        release.wait(5)
+        return "old"
+
+    worker.submit(slow, done.append, errors.append)
+    worker.submit(lambda: "new", done.append, errors.append)
+    release.set()
+
+    pump(owner._proxy, lambda: done)
+    owner._proxy.advance(1000)
+    assert done == ["new"] and errors == []
+
+
+def test_cancelled_result_is_dropped():
+    owner, started, release = FakeWidget(), threading.Event(), threading.Event()
+    worker = Worker(owner)
+    done = []
+
+    def job():
+        started.set()
+        release.wait(5)
+        return "result"
+
+    worker.submit(job, done.append, done.append)
+    started.wait(5)
+    worker.cancel()
+    release.set()
+
+    owner._proxy.advance(1000)
+    worker._executor.shutdown(wait=True)
+    owner._proxy.advance(1000)
+    assert done == [] and not owner._proxy.scheduled
+
+
+def test_value_error_goes_to_on_error():
+    owner = FakeWidget()
+    worker = Worker(owner)
+    done, errors = [], []
+
+    def job():
+        raise ValueError("No possible IVs found.")
+
+    worker.submit(job, done.append, errors.append)
+    pump(owner._proxy, lambda: errors)
+    assert done == [] and [str(e) for e in errors] == ["No possible IVs found."]
+
+
+def test_debouncer_waits_for_a_pause():
+    owner, calls = FakeWidget(), []
+    debouncer = Debouncer(owner, 300, lambda: calls.append(owner._proxy.now))
+
+    for _ in range(5):
+        debouncer.trigger()
+        owner._proxy.advance(100)
+    assert calls == []
+
+    owner._proxy.advance(200)
+    assert calls == [700]
+
+    owner._proxy.advance(1000)
+    assert calls == [700]
+
+
+def test_tabs_are_built_when_first_selected():
+    display = TabbedDisplay.__new__(TabbedDisplay)
+    display._proxy, display.tabs = FakeTk(), ["info", "check", "ranges"]
+    built = []
+
+    display.build_lazily([lambda tab: built.append(tab)] * 3)
+    assert built == ["info"]
+
+    for current in (2, 0, 2, 1):
+        display._proxy.current = current
+        display._proxy.bindings["<<NotebookTabChanged>>"]()
+    assert built == ["info", "ranges", "check"]
+
+
+class FakeInput:
+    def on_change(self, callback):
+        self.changed = callback
+
+
+@pytest.mark.parametrize("live_update", [True, False])
+def test_changed_inputs_cancel_and_recalculate_quietly(live_update):
+    owner, inputs = FakeWidget(), [FakeInput(), FakeInput()]
+    worker = SimpleNamespace(cancelled=0)
+    worker.cancel = lambda: setattr(worker, "cancelled", worker.cancelled + 1)
+    config = SimpleNamespace(ui=SimpleNamespace(live_update=live_update, live_update_delay_ms=300))
+    reports = []
+
+    def recalc(report):
+        report("Invalid value for HP: ''")
+        reports.append(report)
+
+    _watch_inputs(owner, inputs, worker, recalc, config)
+    for widget in inputs:
+        widget.changed()
+    owner._proxy.advance(1000)
+
+    assert worker.cancelled == 2
+    assert len(reports) == (1 if live_update else 0)
@@ -0,0 +1,30 @@
+import time
+
+from ivchecker import instrument
+from ivchecker.runners import IVSolver, Observation, check_ivs, check_ivs_unknown_evs
+
+GARCHOMP = ("garchomp", 9, 50, (183, 150, 115, 90, 105, 122))
+
+
+def test_every_propagating_entry_point_opens_a_check():
+    with instrument.recording() as recorder:
+        check_ivs(*GARCHOMP, "Jolly", (0,) * 6, None, "dragon")
+        time.sleep(0.2)
+        check_ivs_unknown_evs(*GARCHOMP, "Jolly", None, "dragon")
+        time.sleep(0.2)
+        solver = IVSolver("garchomp", 9, "Jolly", hidden_power_type="dragon")
+        solver.add(Observation(50, GARCHOMP[3], (0,) * 6))
+        solver.ivs()
+
+    summary = recorder.summary()
+    assert summary["checks"] == 3 and summary["failed"] == 0
+    assert summary["counters"]["check_ivs_unknown_evs"] == summary["counters"]["IVSolver.ivs"] == 1
+
+    # the sleeps between checks aren't charged to any stage
+    assert all(stage["max_us"] < 100_000 for stage in summary["stages"].values())
+
+
+def test_stages_before_any_check_are_timed_from_the_recorder_start():
+    recorder = instrument.Recorder()
+    recorder.stage("early")
+    assert recorder.summary()["stages"]["early"]["total_ms"] < 1000
@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pytest
+
+from ivchecker.constraints import KnownCharacteristic, KnownHiddenPower
+from ivchecker.engine import MAX_EV, Characteristic, HPType, Nature, Stat, calculate_stat
+from ivchecker.ivset import IVSet
+from ivchecker.kernel import (
+    calculate_stats, filter_characteristic, filter_hidden_power, hidden_power_types, pack_candidates, unpack_candidates
+)
+from ivchecker.runners import STAT_FILTERS
+
+
+def test_calculate_stats_matches_calculate_stat():
+    rng = np.random.default_rng(0)
+    n = 20000
+    level, base, iv, ev = rng.integers(1, 101, n), rng.integers(1, 256, n), rng.integers(0, 32, n), rng.integers(0, MAX_EV + 1, n)
+    stat = rng.integers(0, 6, n)
+    nature = np.where(stat == 0, 1.0, rng.choice([0.9, 1.0, 1.1], n))
+
+    stats = calculate_stats(level, base, iv, ev, nature, stat == 0)
+    expected = [
+        calculate_stat(*map(int, args[:4]), float(args[4]), list(Stat)[int(args[5])])
+        for args in zip(level, base, iv, ev, nature, stat)
+    ]
+    assert stats.tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_stat_filters_agree(seed):
+    rng = random.Random(seed)
+    natures = list(Nature.read_all())
+    for _ in range(500):
+        level = rng.randint(1, 100)
+        basestats = tuple(rng.randint(1, 255) for _ in Stat)
+        evs = tuple(rng.randint(0, MAX_EV) for _ in Stat)
+        nature = rng.choice(natures)
+        stats = tuple(
+            calculate_stat(level, base, rng.randint(0, 31), ev, nature % stat, stat) + rng.randint(-1, 1)
+            for base, ev, stat in zip(basestats, evs, Stat)
+        )
+
+        results = [filter_stats(level, basestats, stats, evs, nature) for filter_stats in STAT_FILTERS.values()]
+        assert all(result == results[0] for result in results)
+
+
+def test_hidden_power_types_match_hp_type():
+    ivs = np.random.default_rng(1).integers(0, 32, (5000, 6))
+    # hidden_power_types takes the IVs in Stat order, like HPType.get
+    assert hidden_power_types(ivs).tolist() == [HPType.get(*spread).value for spread in ivs.tolist()]
+
+
+def random_domains(rng: random.Random) -> dict[Stat, IVSet]:
+    """Random intervals of IVs, some thinned to one parity, none of them empty."""
+    domains = {}
+    for stat in Stat:
+        lo = rng.randint(0, 31)
+        opts = IVSet.from_range(range(lo, rng.randint(lo, 31) + 1))
+        domains[stat] = rng.choice([opts, opts, opts.odds, opts.evens]) or opts
+    return domains
+
+
+def test_filters_match_constraints():
+    rng = random.Random(2)
+    characteristics = [Characteristic.get(description) for description in Characteristic.read_all()]
+    stats = list(Stat)
+
+    rows = [random_domains(rng) for _ in range(2000)]
+    chars = [rng.choice(characteristics) for _ in rows]
+    hp_types = [rng.choice(list(HPType)) for _ in rows]
+
+    masks = np.array([[opts.mask for opts in domains.values()] for domains in rows], dtype=np.uint32)
+    candidates = unpack_candidates(masks)
+    filter_characteristic(candidates, [stats.index(char.high_stat) for char in chars], [char.residue for char in chars])
+    after_char = pack_candidates(candidates)
+    after_hp = after_char.copy()
+    filter_hidden_power(after_hp, [hp_type.value for hp_type in hp_types])
+
+    for domains, char, hp_type, char_row, hp_row in zip(rows, chars, hp_types, after_char.tolist(), after_hp.tolist()):
+        try:
+            narrowed = KnownCharacteristic(char).apply(domains)
+        except ValueError:
+            # no IVs left for the characteristic's stat
+            assert char_row[stats.index(char.high_stat)] == 0
+            continue
+        assert char_row == [opts.mask for opts in narrowed.values()]
+
+        if all(narrowed.values()):
+            assert hp_row == [opts.mask for opts in KnownHiddenPower(hp_type).apply(narrowed).values()]
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from ivchecker.names import NameIndex, _edit_distances, normalize, species_index
+
+
+def levenshtein(a: str, b: str) -> int:
+    """The textbook dynamic programming edit distance."""
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j, y in enumerate(b, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+    return row[-1]
+
+
+def test_edit_distances_match_dynamic_programming():
+    rng = random.Random(0)
+    for _ in range(500):
+        query = "".join(rng.choices("abc-", k=rng.randint(0, 12)))
+        keys = ["".join(rng.choices("abc-", k=rng.randint(0, 12))) for _ in range(5)]
+        assert _edit_distances(query, keys) == [levenshtein(query, key) for key in keys]
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Mega Charizard X", "m-charizard-x"),
+    ("mega-alakazam", "m-alakazam"),
+    ("m-alakazam", "m-alakazam"),
+    ("Galarian Ponyta", "g-ponyta"),
+    ("megaman", "megaman"),
+])
+def test_normalize_spells_forms_like_the_data(name, key):
+    assert normalize(name) == key
+
+
+@pytest.mark.parametrize("query, best", [
+    ("Mega Charizard X", "m-charizard-x"),
+    ("m-charzard-y", "m-charizard-y"),
+    ("mega alakazam", "m-alakazam"),
+    # a form can be found by its name alone
+    ("alakazm", "alakazam"),
+])
+def test_suggestions_understand_form_prefixes(query, best):
+    suggestions = species_index().suggest(query, 3)
+    assert suggestions[0] == best
+    assert all(type(name) is str for name in suggestions)
+
+
+def test_empty_query_suggests_nothing():
+    assert species_index().suggest("", 5) == []
+    assert NameIndex(["bulbasaur"]).suggest("  ", 5) == []
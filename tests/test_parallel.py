@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ivchecker.parallel import check_ivs_parallel
+from ivchecker.runners import check_ivs_batch
+from tests.test_batch import observations
+
+
+@pytest.mark.parametrize("share_tables", [True, False])
+def test_parallel_matches_batch_in_order(share_tables):
+    rows = pd.DataFrame(observations(60, seed=4))
+    calls = []
+
+    masks = check_ivs_parallel(rows, workers=2, chunk_size=7, progress=lambda done, total: calls.append((done, total)), share_tables=share_tables)
+
+    # the shards group rows by species, but the result is in the rows' order
+    np.testing.assert_array_equal(masks, check_ivs_batch(rows))
+
+    assert len(calls) == 9 and calls[-1] == (60, 60)
+    assert all(total == 60 for _, total in calls)
+    assert [done for done, _ in calls] == sorted({done for done, _ in calls})
@@ -0,0 +1,167 @@
+import random
+
+import numpy as np
+import pytest
+
+from ivchecker.engine import (
+    MAX_EV, Characteristic, HPType, Nature, Stat, calculate_stat, get_all_pokemon_names, get_basestats
+)
+from ivchecker.kernel import calculate_stats
+from ivchecker.ivset import IVSet
+from ivchecker.runners import (
+    BATCH_COLUMNS, STAT_FILTERS, IVSolver, Observation, check_ivs, check_ivs_all_natures, check_ivs_batch,
+    check_ivs_unknown_evs, get_ranges
+)
+
+NATURES = list(Nature.read_all())
+
+
+def pokemon(rng: random.Random, evs: list[int]) -> dict:
+    """A random Pokémon with the given EVs, its stats worked out from random IVs."""
+    name, level, nature = rng.choice(get_all_pokemon_names()), rng.randint(1, 100), rng.choice(NATURES)
+    basestats = get_basestats(name, 9)
+    ivs = [rng.randint(0, 31) for _ in Stat]
+    stats = tuple(calculate_stat(level, base, iv, ev, nature % stat, stat) for base, iv, ev, stat in zip(basestats, ivs, evs, Stat))
+    return dict(name=name, level=level, nature=nature, basestats=basestats, ivs=ivs, evs=evs, stats=stats)
+
+
+def every_ev(mon: dict) -> list[dict[int, range]]:
+    """For each stat, the EVs that give its stat with each IV, found by trying every EV
+    (with the kernel, which tests/test_kernel.py checks against calculate_stat).
+    """
+    ivs, evs = np.arange(32)[:, None], np.arange(MAX_EV + 1)
+    result = []
+    for base, actual, stat in zip(mon["basestats"], mon["stats"], Stat):
+        matches = calculate_stats(mon["level"], base, ivs, evs, mon["nature"] % stat, stat == Stat.HP) == actual
+        result.append({
+            iv: range(int(np.argmax(row)), MAX_EV + 1 - int(np.argmax(row[::-1])))
+            for iv, row in enumerate(matches) if row.any()
+        })
+    return result
+
+
+@pytest.mark.parametrize("cap", [None, 510, 300])
+def test_unknown_evs_match_every_ev(cap):
+    rng = random.Random(cap or 0)
+    for _ in range(60):
+        evs = [0] * 6
+        for s in rng.sample(range(6), 2):
+            evs[s] = rng.randint(0, MAX_EV)
+        mon = pokemon(rng, evs)
+
+        result = check_ivs_unknown_evs(mon["name"], 9, mon["level"], mon["stats"], mon["nature"].name, ev_cap=cap)
+        expected = every_ev(mon)
+
+        if cap is not None:
+            # each stat's EVs have to fit under the cap alongside the fewest the others can have
+            needs = [min(r.start for r in by_iv.values()) for by_iv in expected]
+            expected = [
+                {iv: range(r.start, min(r.stop, cap - sum(needs) + needs[s] + 1))
+                 for iv, r in by_iv.items() if r.start <= cap - sum(needs) + needs[s]}
+                for s, by_iv in enumerate(expected)
+            ]
+
+        assert list(result) == expected
+        if cap is None or sum(evs) <= cap:
+            assert all(ev in by_iv[iv] for by_iv, iv, ev in zip(result, mon["ivs"], evs))
+
+
+def test_unknown_evs_keep_the_true_spread_under_its_filters():
+    rng = random.Random(3)
+    tie_order = (Stat.HP, Stat.ATK, Stat.DEF, Stat.SPE, Stat.SPA, Stat.SPD)
+    for _ in range(100):
+        mon = pokemon(rng, [rng.choice([0, 4, MAX_EV]) for _ in Stat])
+        ivs = mon["ivs"]
+        high = next(stat for stat in tie_order if ivs[list(Stat).index(stat)] == max(ivs))
+        characteristic = next(
+            Characteristic.get(c) for c in Characteristic.read_all()
+            if Characteristic.get(c).high_stat == high and Characteristic.get(c).residue == max(ivs) % 5
+        )
+        hp_type = HPType.get(*ivs).name.lower()
+
+        result = check_ivs_unknown_evs(mon["name"], 9, mon["level"], mon["stats"], mon["nature"].name, characteristic, hp_type, ev_cap=None)
+        unfiltered = every_ev(mon)
+
+        for by_iv, everything, iv, ev in zip(result, unfiltered, ivs, mon["evs"]):
+            assert ev in by_iv[iv]
+            assert all(r == everything[i] for i, r in by_iv.items())
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_all_natures_match_each_nature(seed):
+    rng = random.Random(seed)
+    characteristics = list(Characteristic.read_all())
+    for i in range(100):
+        mon = pokemon(rng, [rng.choice([0, MAX_EV, rng.randint(0, MAX_EV)]) for _ in Stat])
+        characteristic = Characteristic.get(rng.choice(characteristics)) if i % 2 else None
+        hp_type = rng.choice(["", "fire", "dark"])
+        args = mon["name"], 9, mon["level"], mon["stats"]
+
+        expected = {}
+        for nature in NATURES:
+            try:
+                ivs = check_ivs(*args, nature.name, tuple(mon["evs"]), characteristic, hp_type)
+            except ValueError:
+                continue
+            if all(ivs):
+                expected[nature.name] = ivs
+
+        result = check_ivs_all_natures(*args, tuple(mon["evs"]), characteristic, hp_type)
+        assert result == expected and list(result) == list(expected)
+        if not characteristic and not hp_type:
+            assert mon["nature"].name in expected
+
+
+def test_solver_matches_each_check():
+    rng = random.Random(5)
+    resolved = 0
+    for i in range(200):
+        mon = pokemon(rng, [0] * 6)
+        solver = IVSolver(mon["name"], 9, mon["nature"].name)
+        expected = [IVSet.all()] * 6
+
+        for level in sorted(rng.sample(range(1, 101), 6)):
+            evs = tuple(rng.randint(0, MAX_EV) for _ in Stat)
+            stats = tuple(
+                calculate_stat(level, base, iv, ev, mon["nature"] % stat, stat)
+                for base, iv, ev, stat in zip(mon["basestats"], mon["ivs"], evs, Stat)
+            )
+            if i % 5 == 0 and level > 50:
+                # a misread stat late on, possibly after every IV is known
+                stats = (stats[0] + 3, *stats[1:])
+
+            resolved += solver.is_resolved
+            consistent = solver.add(Observation(level, stats, evs))
+            checked = check_ivs(mon["name"], 9, level, stats, mon["nature"].name, evs, None, "")
+            expected = [opts & new for opts, new in zip(expected, checked)]
+
+            assert consistent == solver.is_consistent == all(expected)
+            if consistent:
+                assert list(solver.ivs()) == expected
+
+    # the shortcut for known IVs has to have been taken
+    assert resolved
+
+
+@pytest.mark.parametrize("level", [0, 101, 150])
+def test_every_mode_rejects_the_level(level):
+    stats = (183, 150, 115, 90, 105, 122)
+    for backend in STAT_FILTERS:
+        with pytest.raises(ValueError, match="Level must be from 1 to 100"):
+            check_ivs("garchomp", 9, level, stats, "Jolly", (0,) * 6, None, "", backend=backend)
+    with pytest.raises(ValueError, match="Level must be from 1 to 100"):
+        check_ivs_all_natures("garchomp", 9, level, stats, (0,) * 6)
+    with pytest.raises(ValueError, match="Level must be from 1 to 100"):
+        check_ivs_unknown_evs("garchomp", 9, level, stats, "Jolly")
+    with pytest.raises(ValueError, match="Level must be from 1 to 100"):
+        get_ranges("garchomp", 9, level)
+    with pytest.raises(ValueError, match="Level must be from 1 to 100"):
+        IVSolver("garchomp", 9, "Jolly").add(Observation(level, stats, (0,) * 6))
+
+    # one bad row in a batch is enough
+    rows = {"pokemon": ["garchomp"] * 2, "generation": [9] * 2, "level": [50, level], "nature": ["Jolly"] * 2}
+    for stat, value in zip(Stat, stats):
+        rows[f"stat_{stat.value}"], rows[f"ev_{stat.value}"] = [value] * 2, [0] * 2
+    assert set(rows) == set(BATCH_COLUMNS)
+    with pytest.raises(ValueError, match="Level must be from 1 to 100"):
+        check_ivs_batch(rows)
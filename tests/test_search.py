@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from ivchecker.engine import MAX_EV, Nature, Stat, calculate_stat, get_all_pokemon_names, get_basestats, invert_stat
+from ivchecker.search import base_interval, find_species
+
+NATURES = list(Nature.read_all())
+
+
+def linear_scan(level, actual_stats, evs, nature, generation) -> list[str]:
+    """Every species for which some nature (or the given one) leaves every stat an IV, checked one by one."""
+    return [
+        name for name in get_all_pokemon_names()
+        if any(
+            all(invert_stat(level, base, actual, ev, n % stat, stat)
+                for base, actual, ev, stat in zip(get_basestats(name, generation), actual_stats, evs, Stat))
+            for n in ([nature] if nature else NATURES)
+        )
+    ]
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_find_species_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    pokemon, generation, level = rng.choice(get_all_pokemon_names()), rng.randint(3, 9), rng.randint(1, 100)
+    nature = rng.choice(NATURES)
+    evs = tuple(rng.choice([0, MAX_EV, rng.randint(0, MAX_EV)]) for _ in Stat)
+    stats = tuple(
+        calculate_stat(level, base, rng.randint(0, 31), ev, nature % stat, stat)
+        for base, ev, stat in zip(get_basestats(pokemon, generation), evs, Stat)
+    )
+    known = nature if seed % 2 else None
+
+    found = find_species(level, stats, evs, known.name if known else None, generation)
+    assert found == linear_scan(level, stats, evs, known, generation)
+    assert pokemon in found
+
+
+def test_base_interval_is_tight():
+    rng = random.Random(0)
+    for _ in range(300):
+        level, ev, stat = rng.randint(1, 100), rng.randint(0, MAX_EV), rng.choice(list(Stat))
+        modifiers = (1.0,) if stat == Stat.HP else rng.choice([(0.9,), (1.1,), (0.9, 1.0, 1.1)])
+        actual = calculate_stat(level, rng.randint(1, 255), rng.randint(0, 31), ev, rng.choice(modifiers), stat)
+
+        bases = [base for base in range(1024)
+                 if any(invert_stat(level, base, actual, ev, nature, stat) for nature in modifiers)]
+        # With several modifiers, the bases can have gaps between them, which
+        # the interval spans. It isn't clipped at 0, since no species is below.
+        lo, hi = base_interval(level, actual, ev, modifiers, stat)
+        assert (max(lo, 0), hi) == (bases[0], bases[-1])
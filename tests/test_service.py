@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from ivchecker.engine import Characteristic, Nature, Stat, calculate_stat, get_basestats
+from ivchecker.runners import check_ivs
+from ivchecker.service import Service
+
+GOOD = {"pokemon": "garchomp", "generation": 9, "level": 50, "stats": [183, 150, 115, 90, 105, 134], "nature": "Jolly"}
+
+
+def post_all(requests: list[dict]) -> list[tuple[int, dict]]:
+    """POST the requests to /check_ivs concurrently, with the batcher running."""
+    async def run():
+        service = Service(batch_window=0.01)
+        batcher = asyncio.create_task(service.batcher.run())
+        try:
+            return await asyncio.wait_for(asyncio.gather(*(
+                service.dispatch("POST", "/check_ivs", json.dumps(request).encode()) for request in requests
+            )), timeout=30)
+        finally:
+            batcher.cancel()
+
+    return asyncio.run(run())
+
+
+def test_bad_rows_dont_take_down_the_batch():
+    (good, _), (zero, zero_result), (typo, _), (after, _) = post_all([
+        GOOD, {**GOOD, "level": 0}, {**GOOD, "pokemon": "garchmop"}, GOOD,
+    ])
+    assert (good, zero, typo, after) == (200, 422, 422, 200)
+    assert "Level" in zero_result["error"]
+
+
+def test_generation_defaults_to_the_most_recent():
+    [(status, result)] = post_all([{key: value for key, value in GOOD.items() if key != "generation"}])
+    assert status == 200
+    assert result == post_all([GOOD])[0][1]
+
+
+def test_batched_and_single_requests_agree_on_inconsistent_characteristics():
+    # Consistent stats whose characteristic rules out every IV of its stat:
+    # check_ivs reports this as an error, so the batch has to as well.
+    nature = Nature.from_name("Hardy")
+    basestats = get_basestats("garchomp", 9)
+    ivs = (31, 31, 31, 31, 31, 0)
+    stats = [calculate_stat(100, base, iv, 0, nature % stat, stat) for base, iv, stat in zip(basestats, ivs, Stat)]
+    description = next(c for c in Characteristic.read_all()
+                        if Characteristic.get(c).high_stat == Stat.SPE and Characteristic.get(c).residue == 1)
+    request = {**GOOD, "level": 100, "stats": stats, "nature": "Hardy", "characteristic": description}
+
+    try:
+        check_ivs("garchomp", 9, 100, tuple(stats), "Hardy", (0,) * 6, Characteristic.get(description), "")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected check_ivs to rule this out")
+
+    # alone, and batched with a valid request
+    assert post_all([request])[0][0] == 422
+    assert [status for status, _ in post_all([request, GOOD])] == [422, 200]
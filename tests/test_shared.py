@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+from ivchecker.engine import get_all_pokemon_names, get_basestats
+from ivchecker.runners import check_ivs, check_ivs_all_natures
+from ivchecker.shared import SHARED_TABLES_ENV, publish_tables
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# run in a process attached to the published tables
+CHILD = """
+import json
+from ivchecker.dataset import get_dataset
+from ivchecker.engine import Nature, get_all_pokemon_names, get_basestats
+from ivchecker.runners import check_ivs, check_ivs_all_natures
+from ivchecker.shared import attached_tables
+from ivchecker.tables import get_basestat_table
+
+shared = attached_tables().arrays
+dataset, table = get_dataset(), get_basestat_table()
+print(json.dumps({
+    "in_place": [
+        dataset.species_names is shared["species"],
+        dataset.basestats.stats is shared["basestats"],
+        table.index.keys is shared["species_keys"],
+        table.stats is shared["table_stats"],
+        Nature.table()[1] is shared["nature_modifiers"],
+    ],
+    "names": get_all_pokemon_names(),
+    "basestats": [get_basestats(name, 4) for name in ("garchomp", "Mr-Mime", "BUTTERFREE")],
+    "ivs": [ivs.mask for ivs in check_ivs("garchomp", 4, 50, (183, 182, 115, 90, 105, 122), "Jolly", (0,) * 6, None, "")],
+    "natures": sorted(check_ivs_all_natures("garchomp", 4, 50, (183, 182, 115, 90, 105, 122), (0,) * 6)),
+}))
+"""
+
+
+def test_attached_process_reads_tables_in_place():
+    with publish_tables() as tables:
+        env = {**os.environ, SHARED_TABLES_ENV: tables.name, "PYTHONPATH": ROOT}
+        child = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True)
+
+    result = json.loads(child.stdout)
+    assert all(result["in_place"])
+    assert result["names"] == get_all_pokemon_names()
+    assert result["basestats"] == [list(get_basestats(name, 4)) for name in ("garchomp", "Mr-Mime", "BUTTERFREE")]
+    assert result["ivs"] == [ivs.mask for ivs in check_ivs("garchomp", 4, 50, (183, 182, 115, 90, 105, 122), "Jolly", (0,) * 6, None, "")]
+    assert result["natures"] == sorted(check_ivs_all_natures("garchomp", 4, 50, (183, 182, 115, 90, 105, 122), (0,) * 6))
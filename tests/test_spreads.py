@@ -0,0 +1,74 @@
+from itertools import islice, product
+from math import prod
+import random
+
+import pytest
+
+from ivchecker.engine import Characteristic, HPType, Stat
+from ivchecker.ivset import IVSet
+from ivchecker.spreads import count_spreads, iter_spreads
+
+CHARACTERISTICS = [Characteristic.get(description) for description in Characteristic.read_all()]
+HP_TYPES = [""] + [hp_type.name.lower() for hp_type in HPType]
+
+
+def random_case(rng: random.Random) -> tuple[list[IVSet], Characteristic | None, str]:
+    """Random domains small enough to enumerate, with a random characteristic and hidden power type."""
+    while True:
+        if rng.random() < 0.2:
+            domains = [IVSet.from_range(range(lo := rng.randint(0, 28), lo + rng.randint(1, 4))) for _ in Stat]
+        else:
+            domains = [IVSet(rng.getrandbits(32) & rng.getrandbits(32) & rng.getrandbits(32)) for _ in Stat]
+        if prod(max(len(opts), 1) for opts in domains) <= 50_000:
+            return domains, rng.choice([None, *CHARACTERISTICS]), rng.choice(HP_TYPES)
+
+
+def every_spread(domains: list[IVSet], characteristic: Characteristic | None, hidden_power_type: str) -> list[tuple[int, ...]]:
+    """The spreads iter_spreads should give, found by checking every combination of the domains."""
+    spreads = []
+    for spread in product(*domains):
+        if hidden_power_type and HPType.get(*spread).name.lower() != hidden_power_type:
+            continue
+        if characteristic:
+            high = spread[list(Stat).index(characteristic.high_stat)]
+            if high % 5 != characteristic.residue or max(spread) > high:
+                continue
+        spreads.append(spread)
+    return spreads
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_spreads_match_every_combination(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        domains, characteristic, hp_type = random_case(rng)
+        expected = every_spread(domains, characteristic, hp_type)
+
+        assert count_spreads(domains, characteristic, hp_type) == len(expected)
+        assert list(iter_spreads(domains, characteristic, hp_type)) == sorted(expected)
+        assert list(iter_spreads(domains, characteristic, hp_type, reverse=True)) == sorted(expected, reverse=True)
+
+        by_total = sorted(expected, key=lambda spread: (sum(spread), spread))
+        assert list(iter_spreads(domains, characteristic, hp_type, order="total")) == by_total
+        assert list(iter_spreads(domains, characteristic, hp_type, order="total", reverse=True)) == by_total[::-1]
+
+
+def test_every_iv_possible():
+    every_iv = [IVSet.all()] * 6
+    characteristic = CHARACTERISTICS[0]
+
+    # too many to enumerate in full, but the best few come straight away
+    assert count_spreads(every_iv) == 32 ** 6
+    best = list(islice(iter_spreads(every_iv, characteristic, "fire", order="total", reverse=True), 5))
+    assert all(HPType.get(*spread) == HPType.FIRE for spread in best)
+    assert [sum(spread) for spread in best] == sorted((sum(spread) for spread in best), reverse=True)
+
+    # with the other IVs capped low, the count can be checked against enumerating
+    capped = [IVSet.from_range(range(4))] * 6
+    for hp_type in HP_TYPES:
+        assert count_spreads(capped, characteristic, hp_type) == len(list(iter_spreads(capped, characteristic, hp_type)))
+
+
+def test_unknown_order():
+    with pytest.raises(ValueError):
+        list(iter_spreads([IVSet.all()] * 6, order="hp"))
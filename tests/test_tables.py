@@ -0,0 +1,23 @@
+import pytest
+
+from ivchecker.engine import get_basestats
+from ivchecker.tables import get_basestat_table
+
+
+@pytest.mark.parametrize("pokemon, stat, values", [
+    # butterfree's SpA went from 80 to 90 in gen 6
+    ("butterfree", 3, {3: 80, 4: 80, 5: 80, 6: 90, 7: 90, 8: 90, 9: 90}),
+    # mega alakazam's SpD went from 95 to 105 in gen 7
+    ("m-alakazam", 4, {6: 95, 7: 105, 8: 105, 9: 105}),
+])
+def test_stat_changes_apply_by_generation(pokemon, stat, values):
+    table = get_basestat_table()
+    for generation, value in values.items():
+        assert table.get(pokemon, generation)[stat] == value
+        assert get_basestats(pokemon, generation)[stat] == value
+
+
+@pytest.mark.parametrize("generation", [2, 10])
+def test_unsupported_generation(generation):
+    with pytest.raises(ValueError, match=f"Generation {generation} is not supported"):
+        get_basestat_table().get("butterfree", generation)